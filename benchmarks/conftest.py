@@ -0,0 +1,44 @@
+"""Fixtures for the dispatch benchmarks."""
+
+import pytest
+
+from clustafari import DummyConfig, PoolConfig, SlurmConfig, SubprocessConfig
+from clustafari.runner.slurm.scheduler import LocalScheduler
+from clustafari.storage import STORAGE_ENV
+
+RUNNERS = ["dummy", "subprocess", "subprocess-pool", "pool-thread", "pool-process", "fake-slurm", "fake-slurm-pilot"]
+
+
+@pytest.fixture(autouse=True)
+def storage(tmp_path, monkeypatch):
+    """Write job files to a temporary directory."""
+    monkeypatch.setenv(STORAGE_ENV, str(tmp_path))
+    return tmp_path
+
+
+def make_config(name):
+    """Return the node configuration of a benchmarked runner."""
+    if name == "dummy":
+        return DummyConfig()
+    if name == "subprocess":
+        return SubprocessConfig()
+    if name == "subprocess-pool":
+        return SubprocessConfig(pool_size=4)
+    if name == "pool-thread":
+        return PoolConfig(executor="thread", max_workers=4)
+    if name == "pool-process":
+        return PoolConfig(executor="process", max_workers=4)
+    if name in {"fake-slurm", "fake-slurm-pilot"}:
+        return SlurmConfig(status_interval=0.1, pilot=name == "fake-slurm-pilot", scheduler=LocalScheduler())
+
+    msg = f"Unknown runner '{name}'."
+    raise ValueError(msg)
+
+
+@pytest.fixture(params=RUNNERS)
+def config(request):
+    """Node configuration of each benchmarked runner."""
+    config = make_config(request.param)
+    yield config
+    if isinstance(getattr(config, "scheduler", None), LocalScheduler):
+        config.scheduler.wait()
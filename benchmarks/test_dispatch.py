@@ -0,0 +1,104 @@
+"""Benchmarks of the per-task overhead of submitting functions and collecting their results."""
+
+import subprocess
+import sys
+
+import pytest
+
+from clustafari import ClusterContext, DummyConfig, as_completed
+from clustafari.paths import WORKERSTUB
+
+from .conftest import make_config
+
+PAYLOAD_SIZES = [0, 1 << 10, 1 << 20, 16 << 20]
+TASK_COUNTS = [10, 50]
+
+
+def echo(payload):
+    """Return the payload, so it is sent to and from the worker."""
+    return payload
+
+
+def noop():
+    """Do nothing, the pure dispatch overhead."""
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_execute(benchmark, size):
+    """Serialization of a job file by 'Runnable.execute'."""
+    benchmark.group = "execute"
+    payload = bytes(size)
+    with ClusterContext(DummyConfig()) as ctx:
+        runner = ctx._config.runner
+
+        def setup():
+            return (runner._create_runnable(echo, payload),), {}
+
+        benchmark.pedantic(lambda runobj: runobj.execute(), setup=setup, rounds=20)
+
+
+WORKER_COMMANDS = {
+    "workerstub": [sys.executable, WORKERSTUB],
+    "entry-point": [sys.executable, "-c", "from clustafari.workerstub import main; main()"],
+    "entry-point-preimport": [
+        sys.executable,
+        "-c",
+        "from clustafari.workerstub import main; main()",
+        "--preimport=numpy",
+    ],
+}
+
+
+@pytest.mark.parametrize("serializer", ["joblib", "pickle5"])
+@pytest.mark.parametrize("command", list(WORKER_COMMANDS))
+def test_workerstub_startup(benchmark, command, serializer):
+    """Start of a worker process executing a trivial job file.
+
+    The job calls a builtin, so the worker doesn't import any module of the caller.
+    """
+    benchmark.group = "workerstub"
+    with ClusterContext(DummyConfig()) as ctx:
+        runner = ctx._config.runner
+
+        def setup():
+            runobj = runner._create_runnable(abs, 1)
+            runobj.serializer = serializer
+            runobj.prepare()
+            return (runobj,), {}
+
+        def run(runobj):
+            subprocess.run([*WORKER_COMMANDS[command], str(runobj.tempfile)], check=True)
+
+        benchmark.pedantic(run, setup=setup, rounds=10)
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_get(benchmark, size):
+    """Reading the result of a finished job with 'Runnable.get'."""
+    benchmark.group = "get"
+    payload = bytes(size)
+    with ClusterContext(make_config("subprocess")) as ctx:
+
+        def setup():
+            runobj = ctx.apply_async(echo, payload)
+            next(as_completed([runobj]))
+            return (runobj,), {}
+
+        benchmark.pedantic(lambda runobj: runobj.get(), setup=setup, rounds=10)
+
+
+def test_apply(benchmark, config):
+    """Round trip of a single trivial call."""
+    benchmark.group = "apply"
+    with ClusterContext(config) as ctx:
+        benchmark.pedantic(ctx.apply, args=(noop,), rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("size", [0, 1 << 20])
+@pytest.mark.parametrize("tasks", TASK_COUNTS)
+def test_map(benchmark, config, tasks, size):
+    """Throughput of 'map' over many calls."""
+    benchmark.group = f"map-{tasks}x{size}"
+    args = [(bytes(size),)] * tasks
+    with ClusterContext(config) as ctx:
+        benchmark.pedantic(ctx.map, args=(echo, args), rounds=3)
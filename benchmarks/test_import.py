@@ -0,0 +1,26 @@
+"""Benchmarks of the import time of the driver and worker modules."""
+
+import subprocess
+import sys
+
+import pytest
+
+IMPORTS = {
+    "package": "import clustafari",
+    "worker": "import clustafari.workerstub",
+    "driver-subprocess": "from clustafari import ClusterContext, SubprocessConfig",
+    "driver-slurm": "from clustafari import ClusterContext, SlurmConfig",
+}
+
+
+@pytest.mark.parametrize("name", list(IMPORTS))
+def test_import(benchmark, name):
+    """Start of a fresh interpreter importing clustafari modules."""
+    benchmark.group = "import"
+    benchmark.pedantic(subprocess.run, args=([sys.executable, "-c", IMPORTS[name]],), kwargs={"check": True}, rounds=10)
+
+
+def test_interpreter(benchmark):
+    """Start of a fresh interpreter without imports, the baseline of 'test_import'."""
+    benchmark.group = "import"
+    benchmark.pedantic(subprocess.run, args=([sys.executable, "-c", "pass"],), kwargs={"check": True}, rounds=10)
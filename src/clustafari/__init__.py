@@ -1,38 +1,76 @@
-"""Top-level package for PyClustafari."""
+"""Top-level package for PyClustafari.
 
-from joblib import wrap_non_picklable_objects
-from pyprojroot import here
+Exported classes and functions are imported on first access (PEP 562), so importing the package or one of its modules,
+e.g. in a worker process, doesn't load all runners and their dependencies (pyslurm, PyYAML, ...).
+"""
 
-from clustafari.annotations import delayed
-from clustafari.manager import ClusterContext
-from clustafari.runner.dummy import DummyConfig, DummyRunner
-from clustafari.runner.slurm import SlurmConfig, SlurmRunner
-from clustafari.runner.subprocess import SubprocessConfig, SubprocessRunner
+import importlib
+from typing import TYPE_CHECKING, Any
 
-here()
+if TYPE_CHECKING:
+    from joblib import wrap_non_picklable_objects
+
+    from clustafari.annotations import delayed
+    from clustafari.manager import AsyncClusterContext, ClusterContext
+    from clustafari.runner import as_completed
+    from clustafari.runner.dummy import DummyConfig, DummyRunner
+    from clustafari.runner.pool import PoolConfig, PoolRunner
+    from clustafari.runner.queue import QueueConfig, QueueRunner
+    from clustafari.runner.slurm import SlurmConfig, SlurmRunner
+    from clustafari.runner.subprocess import SubprocessConfig, SubprocessRunner
 
 __exports__ = {
-    item.__name__: item
-    for item in [
-        DummyConfig,
-        SlurmConfig,
-        SubprocessConfig,
-        ClusterContext,
-        DummyRunner,
-        SlurmRunner,
-        SubprocessRunner,
-        wrap_non_picklable_objects,
-        delayed,
-    ]
+    "DummyConfig": "clustafari.runner.dummy",
+    "PoolConfig": "clustafari.runner.pool",
+    "QueueConfig": "clustafari.runner.queue",
+    "SlurmConfig": "clustafari.runner.slurm",
+    "SubprocessConfig": "clustafari.runner.subprocess",
+    "ClusterContext": "clustafari.manager",
+    "AsyncClusterContext": "clustafari.manager",
+    "DummyRunner": "clustafari.runner.dummy",
+    "PoolRunner": "clustafari.runner.pool",
+    "QueueRunner": "clustafari.runner.queue",
+    "SlurmRunner": "clustafari.runner.slurm",
+    "SubprocessRunner": "clustafari.runner.subprocess",
+    "wrap_non_picklable_objects": "joblib",
+    "delayed": "clustafari.annotations",
+    "as_completed": "clustafari.runner",
 }
 
+__all__ = [
+    "AsyncClusterContext",
+    "ClusterContext",
+    "DummyConfig",
+    "DummyRunner",
+    "PoolConfig",
+    "PoolRunner",
+    "QueueConfig",
+    "QueueRunner",
+    "SlurmConfig",
+    "SlurmRunner",
+    "SubprocessConfig",
+    "SubprocessRunner",
+    "as_completed",
+    "delayed",
+    "wrap_non_picklable_objects",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported class or function on first access."""
+    module = __exports__.get(name)
+    if module is None:
+        msg = f"module '{__name__}' has no attribute '{name}'"
+        raise AttributeError(msg)
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
-def _set_attributes(attributes: dict):
-    for key, value in attributes.items():
-        globals()[key] = value
 
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__exports__})
 
-_set_attributes(__exports__)
 
 __author__ = """Christian Huber"""
 __email__ = "hiddenaddress@gmail.com"
@@ -0,0 +1,188 @@
+"""Persistent cache for the results of executed functions.
+
+Results are stored under a key computed from the code of the function and its arguments, so calling the same function
+with the same arguments again returns the stored result without submitting anything. The key ignores the identity of
+the function object, only its code and the arguments it is bound to are relevant. Changing the code of a function
+invalidates all its results, as does changing the functions, classes, global variables and closure variables it uses
+from its own module. Changes of code in other modules, e.g. installed packages, are not detected.
+"""
+
+import contextlib
+import inspect
+import logging
+import os
+import time
+import uuid
+from collections.abc import Callable, Mapping
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from clustafari.paths import CLUSTAFARI_DIR
+
+__all__ = ["ResultCache"]
+
+CACHE_DIR = CLUSTAFARI_DIR / "cache"
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(fn: Any, seen: set[int] | None = None) -> Any:
+    """Return a picklable description of the code executed by calling 'fn'."""
+    seen = set() if seen is None else seen
+    if isinstance(fn, partial):
+        return ("partial", _fingerprint(fn.func, seen), fn.args, fn.keywords)
+
+    wrapped = getattr(fn, "__wrapped__", None)
+    if wrapped is not None:
+        return _fingerprint(wrapped, seen)
+
+    bound = getattr(fn, "__self__", None)
+    if bound is not None and not inspect.ismodule(bound):
+        return ("method", _fingerprint(getattr(fn, "__func__", fn), seen), bound)
+
+    name = (getattr(fn, "__module__", None), getattr(fn, "__qualname__", type(fn).__qualname__))
+    code = getattr(fn, "__code__", None)
+    try:
+        return (*name, inspect.getsource(fn), _references(fn, code, seen))
+    except (OSError, TypeError):
+        pass
+
+    if code is not None:
+        return (*name, code.co_code, code.co_consts, _references(fn, code, seen))
+
+    # Callable objects are identified by their state.
+    return (*name, fn)
+
+
+def _global_names(code: Any) -> set[str]:
+    """Return the names a code object and its nested functions look up, including attribute names."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def _references(fn: Any, code: Any, seen: set[int]) -> tuple:
+    """Return fingerprints of the global and closure variables used by a function, each function only once."""
+    if code is None or id(fn) in seen:
+        return ()
+    seen.add(id(fn))
+
+    module = getattr(fn, "__module__", None)
+    namespace = getattr(fn, "__globals__", {})
+    references: list[Any] = [
+        (name, _reference(namespace[name], module, seen)) for name in sorted(_global_names(code)) if name in namespace
+    ]
+    for cell in getattr(fn, "__closure__", None) or ():
+        with contextlib.suppress(ValueError):
+            # Empty cells of variables which are not assigned yet raise ValueError.
+            references.append(_reference(cell.cell_contents, module, seen))
+    return tuple(references)
+
+
+def _reference(value: Any, module: str | None, seen: set[int]) -> Any:
+    """Return the fingerprint of a variable used by a function of 'module'."""
+    if inspect.ismodule(value):
+        return ("module", value.__name__)
+    if callable(value):
+        if getattr(value, "__module__", None) == module:
+            return _fingerprint(value, seen)
+        # Code of other modules, e.g. installed packages, is identified by its name only.
+        return ("external", getattr(value, "__module__", None), getattr(value, "__qualname__", None))
+
+    import joblib
+
+    try:
+        return joblib.hash(value)
+    except Exception:  # noqa: BLE001
+        # Variables which can't be pickled, e.g. locks, don't prevent caching the results of the function.
+        return ("object", type(value).__qualname__)
+
+
+class ResultCache:
+    """Persistent results of function calls, stored in a directory.
+
+    Eviction removes the least recently used results once the total size of the cache exceeds 'max_size' bytes and
+    results which were not used for more than 'max_age' seconds.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_size: int | None = None, max_age: float | None = None) -> None:
+        """Initialize ResultCache in 'directory' with optional size (bytes) and age (seconds) limits."""
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def key(self, fn: Callable, args: tuple, kwargs: Mapping[str, Any]) -> str | None:
+        """Return the key of a function call or None if the call can't be hashed."""
+        import joblib
+
+        try:
+            return joblib.hash((_fingerprint(fn), tuple(args), dict(kwargs)))
+        except Exception:  # noqa: BLE001
+            logger.debug("Can't hash call of '%s', don't cache its result.", fn)
+            return None
+
+    def _file(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.joblib"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return (True, (object, result)) if the key is cached or (False, None) otherwise."""
+        import joblib
+
+        file = self._file(key)
+        try:
+            value = joblib.load(file)
+        except FileNotFoundError:
+            return False, None
+        except Exception:  # noqa: BLE001
+            logger.warning("Can't load cached result '%s', discard it.", key)
+            file.unlink(missing_ok=True)
+            return False, None
+
+        with contextlib.suppress(OSError):
+            os.utime(file)
+        logger.debug("Cache hit '%s'", key)
+        return True, value
+
+    def put(self, key: str, obj: Any, result: Any) -> None:
+        """Store the object and result of a function call."""
+        import joblib
+
+        file = self._file(key)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmpfile = file.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            joblib.dump((obj, result), tmpfile)
+            tmpfile.replace(file)
+        except Exception:  # noqa: BLE001
+            logger.warning("Can't cache result '%s'.", key)
+            tmpfile.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove expired results and least recently used results exceeding the size limit."""
+        if self.max_size is None and self.max_age is None:
+            return
+
+        entries = []
+        for file in self.directory.glob("*/*.joblib"):
+            with contextlib.suppress(OSError):
+                stat = file.stat()
+                entries.append((stat.st_mtime, stat.st_size, file))
+        entries.sort(reverse=True)
+
+        now = time.time()
+        total = 0
+        for mtime, size, file in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired:
+                total += size
+            if expired or (self.max_size is not None and total > self.max_size):
+                logger.debug("Evict cached result '%s'", file.stem)
+                file.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        for file in self.directory.glob("*/*.joblib"):
+            file.unlink(missing_ok=True)
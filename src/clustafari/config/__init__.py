@@ -1,15 +1,16 @@
 """Run configurations package."""
 
 import importlib
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import yaml
-
-from clustafari.paths import JOB_FILE, WORKERSTUB
+from clustafari.paths import WORKERSTUB, get_job_file
 from clustafari.resources import Resource
 from clustafari.runner import BaseRunner
+from clustafari.serialization import get_serializer
+from clustafari.storage import Storage
 
 
 def _get_target(definition: dict[str, str]) -> str:
@@ -43,16 +44,45 @@ def _parse_resources(resources: list[dict[str, str]]) -> list[Resource]:
 class NodeConfig:
     """Node configuration class."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         runner: BaseRunner,
         resources: dict | None = None,
-        jobfile: Path | str = JOB_FILE,
+        jobfile: Path | str | None = None,
         workerstub: Path | str = WORKERSTUB,
+        mmap_threshold: int | None = None,
+        serializer: str | None = None,
+        storage: Storage | Path | str | None = None,
+        submit_parallelism: int = 1,
+        preimport: Iterable[str] | None = None,
     ) -> None:
-        """Initialize NodeConfig with runner, resources, jobfile and workerstub."""
-        self.job_file = jobfile
+        """Initialize NodeConfig with runner, resources, jobfile and workerstub.
+
+        The 'jobfile' defaults to the 'clustafari.job' script of the package, which is looked up on first use.
+
+        NumPy arrays with at least 'mmap_threshold' bytes are passed to and from workers as memory-mapped '.npy' files
+        instead of being pickled. If None, all arguments and results are pickled.
+
+        The 'serializer' of job and result files is given as specification, e.g. 'joblib:lz4:3', 'cloudpickle' or
+        'pickle5' (see 'clustafari.serialization'). Defaults to uncompressed joblib.
+
+        Job files are written to 'storage', given as Storage or root directory (see 'clustafari.storage').
+
+        With 'submit_parallelism' larger than one, job files of a map are serialized and written by that many threads
+        while the jobs prepared so far are submitted.
+
+        Modules in 'preimport' are imported by every worker process before it loads its first job file, which warms
+        heavy libraries once per worker instead of once per job.
+        """
+        get_serializer(serializer)
+
+        self._job_file = jobfile
         self.workerstub = workerstub
+        self.mmap_threshold = mmap_threshold
+        self.serializer = serializer
+        self.storage = storage if isinstance(storage, Storage) else Storage(storage)
+        self.submit_parallelism = submit_parallelism
+        self.preimport = list(preimport or [])
         self.runner = runner
 
         if resources is None:
@@ -60,6 +90,24 @@ class NodeConfig:
 
         self._resources = resources
 
+    @property
+    def job_file(self) -> Path | str:
+        """Return the job script used to start workers."""
+        if self._job_file is None:
+            self._job_file = get_job_file()
+        return self._job_file
+
+    @job_file.setter
+    def job_file(self, jobfile: Path | str) -> None:
+        """Set the job script used to start workers."""
+        self._job_file = jobfile
+
+    def worker_options(self) -> str:
+        """Return the command line options of the workerstub."""
+        if not self.preimport:
+            return ""
+        return f"--preimport {','.join(self.preimport)}"
+
     @property
     def resources(self) -> dict[str, Resource]:
         """Return resource configurations."""
@@ -94,6 +142,8 @@ class NodeConfig:
         if not config_file.exists() or not config_file.is_file():
             return {}
 
+        import yaml
+
         with config_file.open("r") as file:
             defs = yaml.safe_load(file)
 
@@ -1,44 +1,120 @@
 """Main module."""
 
+import asyncio
+import contextlib
 import logging
-from collections.abc import Callable, Iterable, Mapping
-from typing import Any
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
+from clustafari.cache import ResultCache
 from clustafari.config import NodeConfig
-from clustafari.runner import Runnable
+from clustafari.exceptions import RunnableStateError, StateError
+from clustafari.runner import Runnable, as_completed, zip_arguments
+from clustafari.storage import Storage, enter_run, exit_run
 
-__all__ = ["ClusterContext"]
+if TYPE_CHECKING:
+    from contextvars import Token
+
+__all__ = ["AsyncClusterContext", "ClusterContext"]
 
 
 logger = logging.getLogger(__name__)
 
 
 class ClusterContext:
-    """PyClustafari context manager."""
+    """PyClustafari context manager.
+
+    With a result 'cache', calls whose function code and arguments match a previous call return the stored result
+    without submitting a job. Pass True to use a cache with default settings.
+    """
 
-    def __init__(self, config: NodeConfig) -> None:
-        """Initialize ClusterContext with configuration."""
+    def __init__(self, config: NodeConfig, cache: ResultCache | bool | None = None) -> None:  # noqa: FBT001
+        """Initialize ClusterContext with configuration and optional result cache."""
         self._config = config
-        self._runs: list[Runnable] = []
+        self._run: tuple[Storage, Token] | None = None
+        self._runs: weakref.WeakSet[Runnable] = weakref.WeakSet()
+        self._cache = ResultCache() if cache is True else cache or None
+        if self._cache is not None:
+            self._cache.evict()
 
     def __enter__(self) -> "ClusterContext":
-        """Enter context manager."""
+        """Enter context manager, jobs submitted within the context are written to a new run directory."""
+        self._run = enter_run(self._config.storage)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
-        """Exit context manager."""
-        for runnable in self._runs:
-            del runnable
+        """Exit context manager and remove the run directory."""
+        self.cleanup()
+
+        if self._cache is not None:
+            self._cache.evict()
+
+    def cleanup(self, keep_results: bool = False) -> None:  # noqa: FBT001, FBT002
+        """Remove the files of all jobs submitted within the context at once.
+
+        Results which were not retrieved yet are lost and retrieving them raises a RunnableStateError, jobs which are
+        still running fail. With 'keep_results', results of finished jobs are loaded before.
+        """
+        if self._run is None:
+            return
+
+        for runobj in list(self._runs):
+            if keep_results and runobj.is_finished():
+                with contextlib.suppress(StateError, RunnableStateError):
+                    runobj.get()
+            runobj.discard()
+        self._runs.clear()
+
+        exit_run(*self._run)
+        self._run = None
+
+    def _track(self, runobj: Runnable) -> Runnable:
+        if self._run is not None:
+            self._runs.add(runobj)
+        return runobj
+
+    def _cached(self, fn: Callable, args: tuple, kwargs: Mapping, return_object: bool) -> Runnable | str | None:  # noqa: FBT001
+        """Return a finished Runnable if the call is cached, otherwise the cache key to store the result under."""
+        assert self._cache is not None
+        key = self._cache.key(fn, args, kwargs)
+        if key is None:
+            return None
+
+        hit, value = self._cache.get(key)
+        if not hit:
+            return key
+
+        runobj = Runnable(fn, *args, return_object=return_object, **kwargs)
+        runobj.restore(*value)
+        return runobj
+
+    def _store(self, runobj: Runnable, key: str | None) -> Runnable:
+        cache = self._cache
+        if cache is not None and key is not None:
+            runobj.add_done_callback(lambda run: cache.put(key, run.object, run.result))
+        return runobj
 
     def apply(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Any:
         """Create delayed execution of a function and wait for the result."""
         logger.debug("Manage call 'apply'")
+        if self._cache is not None:
+            return self.apply_async(fn, *args, return_object=return_object, **kwargs).get(blocking=True)
         return self._config.runner.apply(fn, *args, return_object=return_object, **kwargs)
 
     def apply_async(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Runnable:
         """Create delayed asyncronouse execution of a function and do NOT wait for the result."""
         logger.debug("Manage call 'apply_async'")
-        return self._config.runner.apply_async(fn, *args, return_object=return_object, **kwargs)
+        if self._cache is None:
+            return self._track(self._config.runner.apply_async(fn, *args, return_object=return_object, **kwargs))
+
+        cached = self._cached(fn, args, kwargs, return_object)
+        if isinstance(cached, Runnable):
+            return cached
+        runobj = self._config.runner.apply_async(fn, *args, return_object=return_object, **kwargs)
+        return self._store(self._track(runobj), cached)
 
     def map(
         self,
@@ -46,11 +122,61 @@ class ClusterContext:
         args: Iterable[Iterable] | None = None,
         kwargs: Iterable[Mapping] | None = None,
         return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
         **fixed_kwargs: Any,
     ) -> list[Any]:
         """Apply function to a list of arguments and wait for the results."""
         logger.debug("Manage call 'map'")
-        return self._config.runner.map(fn, args, kwargs, return_object=return_object, **fixed_kwargs)
+        if self._cache is not None:
+            runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
+            return [runner.get(blocking=True) for runner in runners]
+        return self._config.runner.map(
+            fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs
+        )
+
+    def imap(  # noqa: PLR0913
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        window: int | None = None,
+        **fixed_kwargs: Any,
+    ) -> Iterator[Any]:
+        """Apply function to a list of arguments and iterate over the results in submission order.
+
+        With a result cache, all arguments are read before submitting and 'window' is ignored.
+        """
+        logger.debug("Manage call 'imap'")
+        if self._cache is not None:
+            runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
+            return (runner.get(blocking=True) for runner in runners)
+        return self._config.runner.imap(
+            fn, args, kwargs, return_object=return_object, chunksize=chunksize, window=window, **fixed_kwargs
+        )
+
+    def imap_unordered(  # noqa: PLR0913
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        window: int | None = None,
+        **fixed_kwargs: Any,
+    ) -> Iterator[Any]:
+        """Apply function to a list of arguments and iterate over the results as soon as they are finished.
+
+        With a result cache, all arguments are read before submitting and 'window' is ignored.
+        """
+        logger.debug("Manage call 'imap_unordered'")
+        if self._cache is not None:
+            runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
+            return (runner.get(blocking=True) for runner in as_completed(runners))
+        return self._config.runner.imap_unordered(
+            fn, args, kwargs, return_object=return_object, chunksize=chunksize, window=window, **fixed_kwargs
+        )
 
     def map_async(
         self,
@@ -58,8 +184,130 @@ class ClusterContext:
         args: Iterable[Iterable] | None = None,
         kwargs: Iterable[Mapping] | None = None,
         return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
         **fixed_kwargs: Any,
     ) -> list[Runnable]:
         """Apply function to a list of arguments and do NOT wait for the results."""
         logger.debug("Manage call 'map_async'")
-        return self._config.runner.map_async(fn, args, kwargs, return_object=return_object, **fixed_kwargs)
+        if self._cache is None:
+            runobjs = self._config.runner.map_async(
+                fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs
+            )
+            return [self._track(runobj) for runobj in runobjs]
+
+        found: list[Runnable | None] = []
+        keys: list[str | None] = []
+        missing_args: list[tuple] = []
+        missing_kwargs: list[Mapping] = []
+        for fargs, fkwargs in zip(*zip_arguments(args, kwargs), strict=False):
+            cached = self._cached(fn, tuple(fargs), {**fixed_kwargs, **fkwargs}, return_object)
+            if isinstance(cached, Runnable):
+                found.append(cached)
+                continue
+
+            found.append(None)
+            keys.append(cached)
+            missing_args.append(tuple(fargs))
+            missing_kwargs.append(fkwargs)
+
+        logger.debug("Found %d of %d results in cache", len(found) - len(keys), len(found))
+        submitted: deque[Runnable] = deque()
+        if keys:
+            submitted.extend(
+                self._config.runner.map_async(
+                    fn, missing_args, missing_kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs
+                )
+            )
+
+        keys_iter = iter(keys)
+        return [
+            runobj if runobj is not None else self._store(self._track(submitted.popleft()), next(keys_iter))
+            for runobj in found
+        ]
+
+
+class AsyncClusterContext:
+    """PyClustafari context manager for asyncio applications.
+
+    Jobs are submitted in a worker thread, waiting for their results does not block any thread. The returned Runnables
+    are awaitable.
+    """
+
+    def __init__(self, config: NodeConfig, cache: ResultCache | bool | None = None) -> None:  # noqa: FBT001
+        """Initialize AsyncClusterContext with configuration and optional result cache."""
+        self._context = ClusterContext(config, cache=cache)
+
+    async def __aenter__(self) -> "AsyncClusterContext":
+        """Enter context manager."""
+        self._context.__enter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
+        """Exit context manager."""
+        self._context.__exit__(exc_type, exc_val, exc_tb)
+
+    async def apply(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Any:
+        """Execute a function and wait for the result."""
+        runobj = await self.apply_async(fn, *args, return_object=return_object, **kwargs)
+        return await runobj
+
+    async def apply_async(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Runnable:
+        """Submit the execution of a function and return an awaitable Runnable."""
+        logger.debug("Manage call 'apply_async' in event loop")
+        return await asyncio.to_thread(
+            partial(self._context.apply_async, fn, *args, return_object=return_object, **kwargs)
+        )
+
+    async def map(
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        **fixed_kwargs: Any,
+    ) -> list[Any]:
+        """Apply function to a list of arguments and wait for the results."""
+        runobjs = await self.map_async(
+            fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs
+        )
+        return list(await asyncio.gather(*runobjs))
+
+    async def imap_unordered(
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        **fixed_kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Apply function to a list of arguments and iterate over the results as soon as they are finished."""
+        runobjs = await self.map_async(
+            fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs
+        )
+        for result in asyncio.as_completed([runobj.get_async() for runobj in runobjs]):
+            yield await result
+
+    async def map_async(
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        **fixed_kwargs: Any,
+    ) -> list[Runnable]:
+        """Submit a function for a list of arguments and return awaitable Runnables."""
+        logger.debug("Manage call 'map_async' in event loop")
+        return await asyncio.to_thread(
+            partial(
+                self._context.map_async,
+                fn,
+                args,
+                kwargs,
+                return_object=return_object,
+                chunksize=chunksize,
+                **fixed_kwargs,
+            )
+        )
@@ -0,0 +1,175 @@
+"""Completion notifications sent from workers to the calling process.
+
+Workers send a small UDP datagram for each state transition to the address found in the environment variable
+'CLUSTAFARI_NOTIFY_ADDRESS', together with the random token of the listener. The calling process runs a single
+listener thread which drops datagrams without that token, records the reported states and wakes up waiting Runnables,
+so they don't need to poll state files. Notifications only wake up waiters, the state of a job is always read from its
+state file. They are best-effort; once the listener received a notification, waiting Runnables still check their state
+files every 'CLUSTAFARI_NOTIFY_INTERVAL' seconds (default: 2) in case a datagram got lost. Until then, e.g. if the
+workers can't reach the listener, the state files are polled as without notifications.
+"""
+
+import hmac
+import logging
+import os
+import secrets
+import socket
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from clustafari.utils import State
+
+__all__ = ["NotificationListener", "get_listener", "notify"]
+
+NOTIFY_ADDRESS = "CLUSTAFARI_NOTIFY_ADDRESS"
+NOTIFY_HOST = "CLUSTAFARI_NOTIFY_HOST"
+NOTIFY_DISABLE = "CLUSTAFARI_NOTIFY_DISABLE"
+NOTIFY_INTERVAL = "CLUSTAFARI_NOTIFY_INTERVAL"
+
+MAX_MESSAGE_SIZE = 65507
+FINAL_STATES = (State.FAILED, State.FINISHED)
+FALLBACK_INTERVAL = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+def notify(statefile: Path, state: State) -> None:
+    """Send a state transition of a job to the listening process, if any."""
+    address = os.environ.get(NOTIFY_ADDRESS)
+    if not address:
+        return
+
+    host, port, token = address.rsplit(":", 2)
+    try:
+        family, _, _, _, sockaddr = socket.getaddrinfo(host.strip("[]"), int(port), type=socket.SOCK_DGRAM)[0]
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.sendto(f"{token}\t{state!s}\t{statefile!s}".encode(), sockaddr)
+    except OSError:
+        # Notifications are optional, the listener falls back to the state files.
+        pass
+
+
+class NotificationListener:
+    """Receives state notifications from workers and wakes up waiting threads.
+
+    The listener binds to the notify host only, IPv4 or IPv6, and accepts datagrams carrying its token. The published
+    'address' has the form 'host:port:token', IPv6 hosts are enclosed in brackets.
+    """
+
+    def __init__(self, host: str | None = None, fallback_interval: float | None = None) -> None:
+        """Bind the listener socket and start the receiving thread.
+
+        State files are checked every 'fallback_interval' seconds once notifications arrive, default:
+        'CLUSTAFARI_NOTIFY_INTERVAL' or 2 seconds.
+        """
+        self._states: dict[str, State] = {}
+        self._callbacks: dict[str, list[Callable[[], None]]] = {}
+        self._condition = threading.Condition()
+        self._token = secrets.token_hex(16)
+        self.fallback_interval = fallback_interval or float(os.environ.get(NOTIFY_INTERVAL) or FALLBACK_INTERVAL)
+        self.active = False
+
+        host = host or os.environ.get(NOTIFY_HOST) or socket.gethostname()
+        family, _, _, _, sockaddr = socket.getaddrinfo(host, 0, type=socket.SOCK_DGRAM)[0]
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.bind(sockaddr)
+
+        port = self._socket.getsockname()[1]
+        self.address = f"{f'[{host}]' if ':' in host else host}:{port}:{self._token}"
+
+        self._thread = threading.Thread(target=self._listen, name="clustafari-notify", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                data, _ = self._socket.recvfrom(MAX_MESSAGE_SIZE)
+            except OSError:
+                return
+
+            try:
+                token, name, file = data.decode().split("\t", 2)
+                state = State(name)
+            except ValueError:
+                logger.warning("Ignore malformed notification '%s'", data)
+                continue
+
+            if not hmac.compare_digest(token, self._token):
+                logger.warning("Ignore notification with unknown token")
+                continue
+
+            # Datagrams of the workers reach the listener, the state files are checked less often from now on.
+            self.active = True
+            callbacks = []
+            with self._condition:
+                self._states[file] = state
+                if state in FINAL_STATES:
+                    callbacks = self._callbacks.pop(file, [])
+                    self._condition.notify_all()
+
+            for callback in callbacks:
+                callback()
+
+    def state(self, statefile: Path) -> State | None:
+        """Return the last notified state of a job or None if nothing was received."""
+        return self._states.get(str(statefile))
+
+    def forget(self, statefile: Path) -> None:
+        """Discard the recorded state and pending callbacks of a job."""
+        with self._condition:
+            self._states.pop(str(statefile), None)
+            self._callbacks.pop(str(statefile), None)
+
+    def add_callback(self, statefile: Path, callback: Callable[[], None]) -> None:
+        """Call 'callback' from the listener thread once the job reached a final state.
+
+        If the job is already done, the callback is called immediately.
+        """
+        key = str(statefile)
+        with self._condition:
+            if self._states.get(key) not in FINAL_STATES:
+                self._callbacks.setdefault(key, []).append(callback)
+                return
+
+        callback()
+
+    def wait(self, statefile: Path, timeout: float) -> bool:
+        """Wait until the job reached a final state or the timeout expired. Return True if the job is done."""
+        key = str(statefile)
+        with self._condition:
+            return self._condition.wait_for(lambda: self._states.get(key) in FINAL_STATES, timeout)
+
+    def close(self) -> None:
+        """Stop receiving notifications."""
+        self._socket.close()
+
+
+_listener: NotificationListener | None = None
+_listener_lock = threading.Lock()
+
+
+def get_listener() -> NotificationListener | None:
+    """Return the listener of this process, start it on first use.
+
+    Publishes the listener address to the environment, so workers started afterwards inherit it. Returns None if
+    notifications are disabled or the listener could not be started.
+    """
+    global _listener  # noqa: PLW0603
+
+    if os.environ.get(NOTIFY_DISABLE):
+        return None
+
+    with _listener_lock:
+        if _listener is None:
+            try:
+                _listener = NotificationListener()
+            except OSError as err:
+                logger.warning("Can't start notification listener, fall back to polling: %s", err)
+                os.environ[NOTIFY_DISABLE] = "1"
+                return None
+
+            os.environ[NOTIFY_ADDRESS] = _listener.address
+            logger.debug("Listen for notifications on '%s'", _listener.address)
+
+    return _listener
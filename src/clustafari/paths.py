@@ -1,16 +1,17 @@
 """Important Paths collection."""
 
 import os
+from functools import cache
 from pathlib import Path
-
-from clustafari import workerstub
+from typing import Any
 
 CLUSTAFARI_DIR = Path.home() / ".clustafari"
 CLUSTAFARI_DIR.mkdir(exist_ok=True)
 
 ROOT = Path(__file__).parent.parent.parent
-JOB_FILE = ROOT / "scripts" / "clustafari.job"
-WORKERSTUB = workerstub.__file__
+JOB_FILE_NAME = "clustafari.job"
+WORKERSTUB = str(Path(__file__).parent / "workerstub.py")
+PILOT = str(Path(__file__).parent / "pilot.py")
 
 
 def _find_path_to(prog: str) -> Path:
@@ -23,4 +24,17 @@ def _find_path_to(prog: str) -> Path:
     raise ValueError(msg, prog)
 
 
-JOB_FILE = JOB_FILE if JOB_FILE.exists() else _find_path_to("clustafari.job")
+@cache
+def get_job_file() -> Path:
+    """Return the Slurm job script of the source tree or, if not available, the installed one found in PATH."""
+    job_file = ROOT / "scripts" / JOB_FILE_NAME
+    return job_file if job_file.exists() else _find_path_to(JOB_FILE_NAME)
+
+
+def __getattr__(name: str) -> Any:
+    # The job script is searched in PATH only when needed, which keeps importing this module cheap.
+    if name == "JOB_FILE":
+        return get_job_file()
+
+    msg = f"module '{__name__}' has no attribute '{name}'"
+    raise AttributeError(msg)
@@ -0,0 +1,133 @@
+"""Pilot process executing queued job files inside a single allocation."""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import override
+
+from clustafari.paths import WORKERSTUB
+from clustafari.runner.subprocess.pool import WorkerPool
+from clustafari.taskqueue import POLL_INTERVAL, DirectoryQueue
+from clustafari.utils import JOB_ID, PILOT_RECORD, append_status, get_status_file
+
+__all__ = ["Pilot"]
+
+logger = logging.getLogger(__name__)
+
+
+class Pilot(WorkerPool):
+    """Pool of long-lived workers executing job files claimed from a shared queue.
+
+    Each worker claims the next job file as soon as it is idle and stops once the queue stays empty for
+    'idle_timeout' seconds. A worker which dies is restarted for the next job, the job it was executing is marked as
+    failed. If the queue has a lease timeout, the leases of the claimed job files are renewed in the background. With a
+    'jobid', the pilot records it in the status file of every job file it claims.
+    """
+
+    def __init__(
+        self,
+        queue: DirectoryQueue,
+        command: list[str],
+        size: int,
+        idle_timeout: float = 0.0,
+        jobid: str | None = None,
+    ) -> None:
+        """Initialize Pilot, start 'size' workers running 'command' and executing job files from 'queue'."""
+        self.queue = queue
+        self.idle_timeout = idle_timeout
+        self.jobid = jobid
+        self._stopped = threading.Event()
+
+        self._heartbeat: threading.Thread | None = None
+        if queue.lease_timeout is not None:
+            self._heartbeat = threading.Thread(target=self._renew, name="clustafari-pilot-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+        super().__init__(command, size)
+
+    def _renew(self) -> None:
+        assert self.queue.lease_timeout is not None
+        while not self._stopped.wait(self.queue.lease_timeout / 4):
+            self.queue.heartbeat()
+
+    @override
+    def _next(self) -> Path | None:
+        deadline = time.monotonic() + self.idle_timeout
+        while not self._stopped.is_set():
+            file = self.queue.claim(timeout=min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+            if file is not None:
+                if self.jobid is not None:
+                    append_status(get_status_file(file), [(PILOT_RECORD, self.jobid)])
+                return file
+            if time.monotonic() >= deadline or not self.queue.directory.exists():
+                return None
+        return None
+
+    @override
+    def _done(self, file: Path) -> None:
+        self.queue.complete(file)
+
+    def wait(self) -> None:
+        """Wait until all workers are stopped."""
+        for thread in self._threads:
+            thread.join()
+        self._stopped.set()
+
+    @override
+    def close(self) -> None:
+        """Stop all workers after their current jobs are done."""
+        self._stopped.set()
+        self.wait()
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse commandline arguments."""
+    parser = argparse.ArgumentParser(prog="clustafari-pilot")
+    parser.add_argument("queue", type=Path, help="Directory of the job queue.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of workers, defaults to the number of CPUs available to the process.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=0.0,
+        help="Seconds a worker waits for new job files before it stops.",
+    )
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=None,
+        help="Seconds after which job files claimed by lost workers are executed again.",
+    )
+    parser.add_argument(
+        "--preimport",
+        action="append",
+        default=[],
+        metavar="MODULES",
+        help="Comma-separated modules each worker imports before the first job.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a pilot until its queue is drained, the entry point of 'clustafari-pilot'."""
+    arguments = parse_arguments(argv)
+    size = arguments.workers or len(os.sched_getaffinity(0))
+    command = [sys.executable, WORKERSTUB, "--serve"]
+    command += [f"--preimport={modules}" for modules in arguments.preimport]
+
+    logger.info("Start pilot with %d workers on queue '%s'", size, str(arguments.queue))
+    queue = DirectoryQueue(arguments.queue, lease_timeout=arguments.lease_timeout)
+    pilot = Pilot(queue, command, size, idle_timeout=arguments.idle_timeout, jobid=os.environ.get(JOB_ID))
+    pilot.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,110 @@
 
 import abc
 import logging
-from collections.abc import Callable, Iterable, Mapping
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from itertools import repeat
-from typing import Any
+from itertools import islice, repeat
+from typing import TYPE_CHECKING, Any
+
+from clustafari.storage import Storage, get_storage
+from clustafari.store import SharedObject
 
 from .info import RunInformation
-from .runnable import Runnable
+from .runnable import BatchRunnable, CompletionQueue, Runnable, as_completed
+
+if TYPE_CHECKING:
+    from clustafari.config import NodeConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _get_in_order(runobjs: deque[Runnable]) -> Generator[Any, None, None]:
+    while runobjs:
+        yield runobjs.popleft().get(blocking=True)
+
+
+def _get_as_completed(runobjs: list[Runnable]) -> Generator[Any, None, None]:
+    for runobj in as_completed(runobjs):
+        yield runobj.get(blocking=True)
+
+
+def iter_arguments(
+    args: Iterable[Iterable] | None, kwargs: Iterable[Mapping] | None
+) -> Iterator[tuple[Iterable, Mapping]]:
+    """Lazily pair positional and keyword arguments for a map call."""
+    if args is None and kwargs is None:
+        return iter(())
+
+    iargs = args if args is not None else repeat(())
+    ikwargs = kwargs if kwargs is not None else repeat({})
+    return zip(iargs, ikwargs, strict=args is not None and kwargs is not None)
+
+
+def zip_arguments(
+    args: Iterable[Iterable] | None, kwargs: Iterable[Mapping] | None
+) -> tuple[Iterable[Iterable], Iterable[Mapping]]:
+    """Return matching iterables of positional and keyword arguments for a map call."""
+    nkwargs = 0
+    nargs = 0
+
+    iargs: Iterable | list = []
+    ikwargs: Iterable | list = []
+
+    if args is not None:
+        iargs = list(args)
+        nargs = len(iargs)
+    elif kwargs is not None:
+        iargs = repeat([])
+        nargs = -1
+
+    if kwargs is not None:
+        ikwargs = list(kwargs)
+        nkwargs = len(ikwargs)
+        if nargs == -1:
+            nargs = nkwargs
+    elif args is not None:
+        ikwargs = repeat({})
+        nkwargs = nargs
+
+    if nargs != nkwargs:
+        msg = "If provided, the list of keyword arguments must have the same length as the list of argument."
+        raise ValueError(msg)
+
+    return iargs, ikwargs
+
+
 class BaseRunner(abc.ABC):
-    """Base class for cluster specific Runners."""
+    """Base class for cluster specific Runners.
+
+    Runners which execute functions from job files set 'uses_shared_store', so the function of a map is written to the
+    shared store once instead of into every job file.
+    """
+
+    uses_shared_store = True
+
+    def __init__(self, config: "NodeConfig") -> None:
+        """Initialize Runner with configuration."""
+        self.config = config
+
+    def _share(self, fn: Callable) -> SharedObject | None:
+        """Return a shared reference to the function of a map, or None if the runner doesn't read the shared store."""
+        if not self.uses_shared_store:
+            return None
+        return SharedObject(fn, directory=self._get_storage().store_dir, serializer=self.config.serializer)
+
+    def _create_runnable(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Runnable:
+        """Create a Runnable with the transport settings of the configuration."""
+        runobj = Runnable(fn, *args, return_object=return_object, **kwargs)
+        runobj.mmap_threshold = self.config.mmap_threshold
+        runobj.serializer = self.config.serializer
+        runobj.storage = self._get_storage()
+        return runobj
+
+    def _get_storage(self) -> Storage:
+        """Return the storage for new jobs, which is the run directory of the active ClusterContext if any."""
+        return get_storage(self.config.storage)
 
     def apply(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Any:
         """Create delayed execution of a function and wait for the result."""
@@ -24,15 +115,14 @@ class BaseRunner(abc.ABC):
     def apply_async(self, fn: Callable, /, *args: Any, return_object: bool = False, **kwargs: Any) -> Runnable:
         """Create delayed asyncronouse execution of a function and do NOT wait for the result."""
         logger.debug("Call 'apply_async'")
-        runobj = Runnable(
+        runobj = self._create_runnable(
             fn,
             *args,
             return_object=return_object,
             **kwargs,
         )
 
-        logger.info("Execute '%s' with %s", repr(runobj), self.__class__.__name__)
-        self._run(runobj)
+        self._run_many([runobj])
         return runobj
 
     def map(
@@ -41,55 +131,159 @@ class BaseRunner(abc.ABC):
         args: Iterable[Iterable] | None = None,
         kwargs: Iterable[Mapping] | None = None,
         return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
         **fixed_kwargs: Any,
     ) -> list[Any]:
         """Apply function to a list of arguments and wait for the results."""
         logger.debug("Call 'map'")
-        runners = self.map_async(fn, args, kwargs, return_object=return_object, **fixed_kwargs)
+        runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
         return [runner.get(blocking=True) for runner in runners]
 
+    def imap(  # noqa: PLR0913
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        window: int | None = None,
+        **fixed_kwargs: Any,
+    ) -> Iterator[Any]:
+        """Apply function to a list of arguments and return an iterator over the results in submission order.
+
+        If 'window' is set, the arguments are consumed lazily and at most 'window' jobs are submitted but not yet
+        returned at any time.
+        """
+        logger.debug("Call 'imap'")
+        if window is not None:
+            return self._stream(fn, args, kwargs, return_object, chunksize, window, fixed_kwargs, ordered=True)
+        runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
+        return _get_in_order(deque(runners))
+
+    def imap_unordered(  # noqa: PLR0913
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None = None,
+        kwargs: Iterable[Mapping] | None = None,
+        return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
+        window: int | None = None,
+        **fixed_kwargs: Any,
+    ) -> Iterator[Any]:
+        """Apply function to a list of arguments and return an iterator over the results as they are finished.
+
+        If 'window' is set, the arguments are consumed lazily and at most 'window' jobs are submitted but not yet
+        returned at any time.
+        """
+        logger.debug("Call 'imap_unordered'")
+        if window is not None:
+            return self._stream(fn, args, kwargs, return_object, chunksize, window, fixed_kwargs, ordered=False)
+        runners = self.map_async(fn, args, kwargs, return_object=return_object, chunksize=chunksize, **fixed_kwargs)
+        return _get_as_completed(runners)
+
+    def _stream(  # noqa: PLR0913
+        self,
+        fn: Callable,
+        args: Iterable[Iterable] | None,
+        kwargs: Iterable[Mapping] | None,
+        return_object: bool,  # noqa: FBT001
+        chunksize: int,
+        window: int,
+        fixed_kwargs: Mapping[str, Any],
+        ordered: bool,  # noqa: FBT001
+    ) -> Generator[Any, None, None]:
+        """Submit calls lazily while iterating over their results, keeping at most 'window' jobs in flight."""
+        partial_fn = partial(fn, **fixed_kwargs)
+        shared_fn = self._share(partial_fn)
+        calls = iter_arguments(args, kwargs)
+
+        chunksize = max(1, chunksize)
+        window = max(window, chunksize)
+        in_order: deque[Runnable] = deque()
+        completion = CompletionQueue()
+        exhausted = False
+
+        while True:
+            inflight = len(in_order) if ordered else len(completion)
+            free = window - inflight
+            if not exhausted and (free >= chunksize or inflight == 0):
+                runobjs = []
+                for a, kwa in islice(calls, free - free % chunksize):
+                    runobj = self._create_runnable(partial_fn, *a, return_object=return_object, **kwa)
+                    runobj.shared_function = shared_fn
+                    runobjs.append(runobj)
+
+                exhausted = len(runobjs) < free - free % chunksize
+                self._run_many(runobjs, chunksize=chunksize)
+                if ordered:
+                    in_order.extend(runobjs)
+                else:
+                    for runobj in runobjs:
+                        completion.add(runobj)
+                continue
+
+            if not inflight:
+                return
+
+            runobj = in_order.popleft() if ordered else completion.get()
+            yield runobj.get(blocking=True)
+
     def map_async(
         self,
         fn: Callable,
         args: Iterable[Iterable] | None = None,
         kwargs: Iterable[Mapping] | None = None,
         return_object: bool = False,  # noqa: FBT001, FBT002
+        chunksize: int = 1,
         **fixed_kwargs: Any,
     ) -> list[Runnable]:
-        """Apply function to a list of arguments and do NOT wait for the results."""
+        """Apply function to a list of arguments and do NOT wait for the results.
+
+        If 'chunksize' is larger than one, the calls are grouped into batches of 'chunksize' elements and each batch is
+        executed by a single worker.
+        """
         logger.debug("Call 'map_async'")
 
-        nkwargs = 0
-        nargs = 0
+        iargs, ikwargs = zip_arguments(args, kwargs)
 
-        iargs: Iterable | list = []
-        ikwargs: Iterable | list = []
+        partial_fn = partial(fn, **fixed_kwargs)
+        shared_fn = self._share(partial_fn)
+        runobjs = []
+        for a, kwa in zip(iargs, ikwargs, strict=False):
+            runobj = self._create_runnable(partial_fn, *a, return_object=return_object, **kwa)
+            runobj.shared_function = shared_fn
+            runobjs.append(runobj)
 
-        if args is not None:
-            iargs = list(args)
-            nargs = len(iargs)
-        elif kwargs is not None:
-            iargs = repeat([])
-            nargs = -1
+        self._run_many(runobjs, chunksize=chunksize)
+        return runobjs
 
-        if kwargs is not None:
-            ikwargs = list(kwargs)
-            nkwargs = len(ikwargs)
-            if nargs == -1:
-                nargs = nkwargs
-        elif args is not None:
-            ikwargs = repeat({})
-            nkwargs = nargs
+    def _run_many(self, runobjs: list[Runnable], chunksize: int = 1) -> list[RunInformation]:
+        """Deploy several Runnables. Runners may override this to submit them in bulk."""
+        infos = []
+        for runobj in self._prepare_all(BatchRunnable.split(runobjs, chunksize)):
+            logger.info("Execute '%s' with %s", repr(runobj), self.__class__.__name__)
+            infos.append(self._run(runobj))
+        return infos
 
-        if nargs != nkwargs:
-            msg = "If provided, the list of keyword arguments must have the same length as the list of argument."
-            raise ValueError(msg)
+    def _prepare_all(self, runobjs: list[Runnable]) -> Iterator[Runnable]:
+        """Prepare Runnables for deployment and yield them in order.
 
-        partial_fn = partial(fn, **fixed_kwargs)
-        return [
-            self.apply_async(partial_fn, *a, return_object=return_object, **kwa)
-            for a, kwa in zip(iargs, ikwargs, strict=False)
-        ]
+        With a 'submit_parallelism' larger than one, the job files are serialized and written by a pool of threads
+        ahead of the caller, which submits the prepared Runnables in the meantime.
+        """
+        parallelism = self.config.submit_parallelism
+        if parallelism <= 1 or len(runobjs) < 2:  # noqa: PLR2004
+            for runobj in runobjs:
+                runobj.prepare()
+                yield runobj
+            return
+
+        logger.debug("Prepare %d Runnables with %d threads", len(runobjs), parallelism)
+        with ThreadPoolExecutor(parallelism, thread_name_prefix="clustafari-prepare") as executor:
+            futures = [executor.submit(runobj.prepare) for runobj in runobjs]
+            for runobj, future in zip(runobjs, futures, strict=True):
+                future.result()
+                yield runobj
 
     @abc.abstractmethod
     def _run(self, runobj: Runnable) -> RunInformation: ...
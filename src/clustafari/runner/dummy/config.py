@@ -5,7 +5,7 @@ from clustafari.config import NodeConfig
 
 class _DummyConfig(NodeConfig):
     def __init__(self, runner_cls: type) -> None:
-        super().__init__(runner=runner_cls(), resources={}, jobfile="", workerstub="")
+        super().__init__(runner=runner_cls(self), resources={}, jobfile="", workerstub="")
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__[1:]}({self.resources})"
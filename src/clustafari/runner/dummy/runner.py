@@ -17,10 +17,12 @@ logger = logging.getLogger(__name__)
 class DummyRunner(BaseRunner):
     """Runs a JobLib file in a new Python instance."""
 
+    uses_shared_store = False
+
     @override
     def _run(self, runobj: Runnable) -> RunInformation:
         logger.info("Execute Runner '%s'", self.__class__.__name__)
-        runobj.execute()
+        runobj.prepare()
 
         info = RunInformation()
         fn = runobj.function
@@ -41,3 +43,8 @@ class DummyRunner(BaseRunner):
 
         runobj.result = info.result
         return info
+
+    @override
+    def _run_many(self, runobjs: list[Runnable], chunksize: int = 1) -> list[RunInformation]:
+        # Runs in the calling process, batching has no benefit here.
+        return super()._run_many(runobjs)
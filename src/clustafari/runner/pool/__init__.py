@@ -0,0 +1,14 @@
+"""Export PoolRunner."""
+
+from typing import Any
+
+from .config import _PoolConfig
+from .runner import PoolRunner
+
+
+class PoolConfig(_PoolConfig):
+    """Configuration for PoolRunner."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize PoolConfig with PoolRunner."""
+        super().__init__(runner_cls=PoolRunner, **kwargs)
@@ -0,0 +1,31 @@
+"""Cluster configuration for PoolRunner."""
+
+from clustafari.config import NodeConfig
+
+EXECUTORS = ("process", "thread")
+
+
+class _PoolConfig(NodeConfig):
+    """Configuration for PoolRunner."""
+
+    def __init__(
+        self,
+        runner_cls: type,
+        executor: str = "process",
+        max_workers: int | None = None,
+        mp_context: str | None = "spawn",
+    ) -> None:
+        if executor not in EXECUTORS:
+            msg = f"Executor must be one of {EXECUTORS} but got '{executor}'."
+            raise ValueError(msg)
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        super().__init__(runner=runner_cls(self), resources={}, jobfile="", workerstub="")
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__[1:]}({self.executor}, max_workers={self.max_workers})"
+
+    def __repr__(self) -> str:
+        return str(self)
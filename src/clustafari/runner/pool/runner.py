@@ -0,0 +1,77 @@
+"""Strategy for executing functions on a local process or thread pool."""
+
+import logging
+import multiprocessing
+from concurrent import futures
+from io import StringIO
+from typing import Any, override
+
+from clustafari.runner import BaseRunner, RunInformation, Runnable
+from clustafari.utils import redirect_io
+
+from .config import _PoolConfig
+
+__all__ = ["PoolRunner"]
+
+logger = logging.getLogger(__name__)
+
+
+def _call(fn: Any, args: Any, kwargs: Any, capture: bool) -> tuple[Any, Any, str, str]:  # noqa: FBT001
+    """Call the function and return the bound object, the result, the output and the error output."""
+    fnobj = None
+    if hasattr(fn, "__self__"):
+        fnobj = fn.__self__
+
+    if not capture:
+        return fnobj, fn(*args, **kwargs), "", ""
+
+    out = StringIO()
+    err = StringIO()
+    with redirect_io(out, err):
+        result = fn(*args, **kwargs)
+
+    return fnobj, result, out.getvalue(), err.getvalue()
+
+
+class PoolRunner(BaseRunner):
+    """Runs functions on a local 'concurrent.futures' process or thread pool.
+
+    Functions and arguments are passed to the pool directly, no job files are written. Output is captured for process
+    pools only, the standard streams are shared by all threads of a thread pool.
+    """
+
+    config: _PoolConfig
+    uses_shared_store = False
+
+    def __init__(self, config: _PoolConfig) -> None:
+        """Initialize Pool Runner with configuration."""
+        super().__init__(config)
+        self._executor: futures.Executor | None = None
+
+    def _get_executor(self) -> futures.Executor:
+        if self._executor is None:
+            if self.config.executor == "thread":
+                self._executor = futures.ThreadPoolExecutor(self.config.max_workers, thread_name_prefix="clustafari")
+            else:
+                context = multiprocessing.get_context(self.config.mp_context)
+                self._executor = futures.ProcessPoolExecutor(self.config.max_workers, mp_context=context)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the pool after all submitted functions are executed."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @override
+    def _run(self, runobj: Runnable) -> RunInformation:
+        logger.info("Execute Runner '%s'", self.__class__.__name__)
+        capture = self.config.executor == "process"
+        future = self._get_executor().submit(_call, runobj.function, runobj.args, runobj.kwargs, capture)
+        runobj.attach(future)
+        return runobj.info
+
+    @override
+    def _run_many(self, runobjs: list[Runnable], chunksize: int = 1) -> list[RunInformation]:
+        # Calls are passed to the pool one by one, there are no job files to batch or prepare.
+        return [self._run(runobj) for runobj in runobjs]
@@ -0,0 +1,14 @@
+"""Export QueueRunner."""
+
+from typing import Any
+
+from .config import _QueueConfig
+from .runner import QueueRunner
+
+
+class QueueConfig(_QueueConfig):
+    """Configuration for QueueRunner."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize QueueConfig with QueueRunner."""
+        super().__init__(runner_cls=QueueRunner, **kwargs)
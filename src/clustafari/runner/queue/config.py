@@ -0,0 +1,49 @@
+"""Cluster configuration for QueueRunner."""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+from clustafari.config import NodeConfig
+from clustafari.storage import Storage
+from clustafari.taskqueue import MAX_ATTEMPTS
+
+LEASE_TIMEOUT = 60.0
+
+
+class _QueueConfig(NodeConfig):
+    """Configuration for QueueRunner."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        runner_cls: type,
+        directory: Path | str | None = None,
+        workers: int = 0,
+        lease_timeout: float = LEASE_TIMEOUT,
+        max_attempts: int = MAX_ATTEMPTS,
+        mmap_threshold: int | None = None,
+        serializer: str | None = None,
+        storage: Storage | Path | str | None = None,
+        submit_parallelism: int = 1,
+        preimport: Iterable[str] | None = None,
+    ) -> None:
+        self.workers = workers
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        super().__init__(
+            runner=runner_cls(self),
+            resources={},
+            jobfile="",
+            workerstub="",
+            mmap_threshold=mmap_threshold,
+            serializer=serializer,
+            storage=storage,
+            submit_parallelism=submit_parallelism,
+            preimport=preimport,
+        )
+        self.directory = Path(directory) if directory is not None else self.storage.root / "queue"
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__[1:]}({self.directory!s}, workers={self.workers})"
+
+    def __repr__(self) -> str:
+        return str(self)
@@ -0,0 +1,78 @@
+"""Strategy for executing job files from a shared queue."""
+
+import logging
+import math
+import sys
+from typing import override
+
+from clustafari.exceptions import StateError
+from clustafari.paths import WORKERSTUB
+from clustafari.pilot import Pilot
+from clustafari.runner import BaseRunner, BatchRunnable, RunInformation, Runnable
+from clustafari.taskqueue import DirectoryQueue
+
+from .config import _QueueConfig
+
+__all__ = ["QueueRunner"]
+
+logger = logging.getLogger(__name__)
+
+
+class QueueRunner(BaseRunner):
+    """Puts job files into a queue directory which is drained by any number of pilots.
+
+    Pilots can run anywhere the queue directory is visible, e.g. started with 'clustafari-pilot <directory>' on
+    heterogeneous nodes or as Slurm jobs. Idle workers take the next job, so fast nodes execute more jobs than slow
+    ones. Jobs of lost workers are executed again once their lease expired. If the configuration sets 'workers', a
+    local pilot with that many workers drains the queue as well.
+    """
+
+    config: _QueueConfig
+
+    def __init__(self, config: _QueueConfig) -> None:
+        """Initialize Queue Runner with configuration."""
+        super().__init__(config)
+        self._queue: DirectoryQueue | None = None
+        self._pilot: Pilot | None = None
+
+    def _get_queue(self) -> DirectoryQueue:
+        if self._queue is None:
+            self._queue = DirectoryQueue(
+                self.config.directory, lease_timeout=self.config.lease_timeout, max_attempts=self.config.max_attempts
+            )
+        return self._queue
+
+    def _start_pilot(self) -> None:
+        if self._pilot is not None or not self.config.workers:
+            return
+
+        command = [sys.executable, WORKERSTUB, *self.config.worker_options().split(), "--serve"]
+        self._pilot = Pilot(self._get_queue(), command, self.config.workers, idle_timeout=math.inf)
+
+    def close(self) -> None:
+        """Stop the local pilot, if any, after its current jobs are done."""
+        if self._pilot is not None:
+            self._pilot.close()
+            self._pilot = None
+
+    def _put(self, runobjs: list[Runnable]) -> list[RunInformation]:
+        for runobj in runobjs:
+            if runobj.tempfile is None:
+                raise StateError
+            runobj.info = RunInformation()
+
+        self._get_queue().put(runobj.tempfile for runobj in runobjs)  # type: ignore  # noqa: PGH003
+        self._start_pilot()
+        return [runobj.info for runobj in runobjs]
+
+    @override
+    def _run(self, runobj: Runnable) -> RunInformation:
+        logger.info("Execute Runner '%s'", self.__class__.__name__)
+        runobj.prepare()
+        return self._put([runobj])[0]
+
+    @override
+    def _run_many(self, runobjs: list[Runnable], chunksize: int = 1) -> list[RunInformation]:
+        runobjs = BatchRunnable.split(runobjs, chunksize)
+        logger.info("Queue %d Runnables with '%s'", len(runobjs), self.__class__.__name__)
+        return self._put(list(self._prepare_all(runobjs)))
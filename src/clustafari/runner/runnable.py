@@ -1,29 +1,46 @@
 """Function wrapper classes."""
 
+import asyncio
+import contextlib
+import itertools
 import logging
+import queue
 import time
-from collections.abc import Callable, Iterable, Mapping
+import uuid
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Mapping
+from concurrent import futures
+from functools import partial
 from pathlib import Path
-from typing import Any
-
-import joblib
+from typing import TYPE_CHECKING, Any
 
 from clustafari.exceptions import RunnableStateError, StateError, TimeoutException
-from clustafari.paths import CLUSTAFARI_DIR
+from clustafari.notify import FINAL_STATES, NotificationListener, get_listener
+from clustafari.serialization import dump, load
+from clustafari.storage import Storage
+from clustafari.transport import externalize, resolve
 from clustafari.utils import (
     State,
     get_error_file,
-    get_log_file,
     get_output_file,
     get_result_file,
-    get_state_file,
+    get_status_file,
+    read_status,
 )
 
 from .info import RunInformation
 from .state import RunState
 
+if TYPE_CHECKING:
+    from clustafari.store import SharedObject
+
 logger = logging.getLogger(__name__)
 
+POLL_INTERVAL = 0.1
+NOTIFIED_POLL_INTERVAL = 2.0
+
+_job_counter = itertools.count()
+
 
 def _get_function_name(fn: Callable):
     if hasattr(fn, "func"):
@@ -33,6 +50,11 @@ def _get_function_name(fn: Callable):
     return fn.__qualname__
 
 
+def _new_job_id() -> str:
+    """Return a unique job ID. It's independent of the arguments, so its cost does not grow with their size."""
+    return f"{uuid.uuid4().hex}-{next(_job_counter)}"
+
+
 def _get_partial_arguments(fn: Callable) -> tuple[tuple, Mapping]:
     if hasattr(fn, "func") and hasattr(fn, "args") and hasattr(fn, "keywords"):
         return fn.args, fn.keywords  # type: ignore  # noqa: PGH003
@@ -59,17 +81,24 @@ class Runnable:
         self.function: Callable = fn
         self.args: Iterable = args
         self.kwargs: Mapping = kwargs
+        self.shared_function: SharedObject | None = None
+        self.mmap_threshold: int | None = None
+        self.serializer: str | None = None
+        self.storage: Storage = Storage()
 
         self.return_object = return_object
 
-        self._timestamp: int = time.monotonic_ns()
+        self.job_id: str | None = None
         self.tempdir: Path | None = None
         self.tempfile: Path | None = None
         self.resultfile: Path | None = None
         self.outputfile: Path | None = None
         self.errorfile: Path | None = None
-        self.logfile: Path | None = None
         self.statefile: Path | None = None
+        self._listener: NotificationListener | None = None
+        self._batch: BatchRunnable | None = None
+        self._callbacks: list[Callable[[Runnable], None]] = []
+        self._future: futures.Future | None = None
 
         logger.info("Create Runnable: %s", repr(self))
 
@@ -89,7 +118,12 @@ class Runnable:
             raise RunnableStateError(msg)
 
         self._result = result
-        self._state = RunState.FINISHED
+        self._finish()
+
+    @property
+    def object(self) -> Any:
+        """Return the object the executed method was bound to, if any."""
+        return self._object
 
     @property
     def info(self) -> Any:
@@ -107,69 +141,155 @@ class Runnable:
             raise RunnableStateError(msg)
 
         try:
-            function_data = (self.function, self.args, self.kwargs)
+            self.job_id = _new_job_id()
+            self.tempdir = self.storage.create_job_dir(self.job_id)
 
-            self.tempdir = CLUSTAFARI_DIR / f"{self._get_hash()}"
-            self.tempdir.mkdir(exist_ok=True)
+            function_data = externalize(self._job_data(), self.tempdir, self.mmap_threshold, prefix="arg")
 
             self.tempfile = self.tempdir / f"{_get_function_name(self.function)}.joblib"
             self.resultfile = get_result_file(self.tempfile)
             self.outputfile = get_output_file(self.tempfile)
             self.errorfile = get_error_file(self.tempfile)
-            self.logfile = get_log_file(self.tempfile)
-            self.statefile = get_state_file(self.tempfile)
+            self.statefile = get_status_file(self.tempfile)
+            self._listener = get_listener()
 
             logger.debug(
                 "Dump serialized Runnable '%s' to file '%s'",
                 repr(self),
                 str(self.tempfile),
             )
-            joblib.dump(function_data, self.tempfile)
+            dump(function_data, self.tempfile, self.serializer)
             self._state = RunState.READY
         except RuntimeError as err:
             self._state = RunState.FAILED
             self._info.log += str(err)
 
-    def _get_hash(self) -> str | None:
-        return joblib.hash((self.function, self.args, self.kwargs, self._timestamp))
+    def prepare(self) -> None:
+        """Prepare the executable for deployment unless this was done already."""
+        if self._state == RunState.INITIALIZED:
+            self.execute()
+
+    def restore(self, obj: Any, result: Any) -> None:
+        """Finish the Runnable with a previously computed result instead of executing it."""
+        if self._state != RunState.INITIALIZED:
+            msg = f"Restoring a result is only possible in state {RunState.INITIALIZED} but got {self._state}."
+            raise RunnableStateError(msg)
+
+        self._object = obj
+        self._result = result
+        self._finish()
+
+    def attach(self, future: futures.Future) -> None:
+        """Execute the Runnable in memory instead of through job files.
+
+        The 'future' must resolve to a tuple of the bound object, the result, the output and the error output.
+        """
+        if self._state != RunState.INITIALIZED:
+            msg = f"Attaching a future is only possible in state {RunState.INITIALIZED} but got {self._state}."
+            raise RunnableStateError(msg)
+
+        self._future = future
+        self._state = RunState.READY
+
+    def add_done_callback(self, callback: Callable[["Runnable"], None]) -> None:
+        """Call 'callback' with this Runnable once its result is available.
+
+        Callbacks are called when the result is retrieved, or immediately if it is already available. They are not
+        called for failed executions.
+        """
+        if self._state == RunState.FINISHED:
+            callback(self)
+            return
+
+        self._callbacks.append(callback)
+
+    def _finish(self) -> None:
+        self._state = RunState.FINISHED
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def _job_data(self) -> Any:
+        options = {"mmap_threshold": self.mmap_threshold}
+        return (self.shared_function or self.function, self.args, self.kwargs, options)
+
+    def content_hash(self) -> str | None:
+        """Return a hash of the function and its arguments, identical calls get the same hash.
+
+        Hashing reads all arguments, which is expensive for large inputs. Job IDs don't depend on it.
+        """
+        import joblib
+
+        return joblib.hash((self.function, self.args, self.kwargs))
 
     def is_finished(self) -> bool:
         """Return whether the execution is finished."""
-        if self._state == RunState.FINISHED:
+        if self._state in (RunState.FINISHED, RunState.REMOVED):
+            return True
+
+        if self._state == RunState.FAILED and self._batch is not None:
+            # Failed within a batch, the error was collected with the results of the batch.
             return True
 
+        if self._future is not None:
+            return self._state == RunState.READY and self._future.done()
+
         return self._state == RunState.READY and self._read_state_file() in [
             State.FAILED,
             State.FINISHED,
         ]
 
+    def discard(self) -> None:
+        """Mark the files of the job as removed, e.g. with the run directory of a ClusterContext.
+
+        A result which was not retrieved before is lost, retrieving it raises a RunnableStateError.
+        """
+        if self._state != RunState.READY or self._future is not None:
+            return
+
+        if self._listener is not None and self.statefile is not None:
+            self._listener.forget(self.statefile)
+        self._state = RunState.REMOVED
+
     def _delete_temp_files(self):
-        if self.tempdir is None or not self.tempdir.exists():
+        if self.tempdir is None:
+            return
+
+        if self._listener is not None and self.statefile is not None:
+            self._listener.forget(self.statefile)
+
+        if not self.tempdir.exists():
             return
 
         for file in self.tempdir.iterdir():
             file.unlink(missing_ok=True)
 
-        self.tempdir.rmdir()
+        try:
+            self.tempdir.rmdir()
+        except OSError:
+            # Files still memory-mapped by the caller may linger on network file systems.
+            logger.debug("Can't remove temp directory '%s'", str(self.tempdir))
 
     def _read_state_file(self) -> State:
-        if self.statefile is None or not self.statefile.exists():
-            return State.IDLE
+        state, _ = self._read_status()
+        return state
 
-        with self.statefile.open("r") as f:
-            content = f.read().strip()
-
-        return State(content.lower())
+    def _read_status(self) -> tuple[State, str]:
+        if self.statefile is None:
+            return State.IDLE, ""
+        return read_status(self.statefile)
 
     def _read_job_file(self, file: Path | None) -> tuple[Any, Any]:
         if file is None or not file.exists():
             return None, None
 
         try:
-            return joblib.load(file)
+            data = load(file)
         except EOFError:
             return None, None
 
+        return resolve(data) if self.mmap_threshold is not None else data
+
     def _read_file(self, file: Path | None) -> str:
         if file is None or not file.exists():
             return ""
@@ -182,24 +302,41 @@ class Runnable:
 
     def _read_result_files(self) -> None:
         assert self.is_finished(), "Must not read results before they are ready."
+        if self._batch is not None:
+            self._batch._read_result_files()  # noqa: SLF001
+            return
+
+        if self._future is not None:
+            self._read_future()
+            return
+
         self._object, self._result = self._read_job_file(self.resultfile)
 
         out = self._read_file(self.outputfile)
         err = self._read_file(self.errorfile)
-
-        log = self._read_file(self.logfile)
+        state, log = self._read_status()
 
         self._info.output = out
         self._info.error = err
         self._info.log = log
 
-        if self._read_state_file() == State.FINISHED:
-            self._state = RunState.FINISHED
+        if state == State.FINISHED:
+            self._finish()
         else:
             self._state = RunState.FAILED
 
         self._delete_temp_files()
 
+    def _read_future(self) -> None:
+        assert self._future is not None
+        try:
+            self._object, self._result, self._info.output, self._info.error = self._future.result()
+        except Exception as e:  # noqa: BLE001
+            self._info.error += str(e)
+            self._state = RunState.FAILED
+        else:
+            self._finish()
+
     def get(self, blocking: bool = False, timeout: int = -1) -> Any:  # noqa: FBT001, FBT002
         """Retrieve the result of the execution.
 
@@ -210,19 +347,23 @@ class Runnable:
             msg = "Job was not stated."
             raise RunnableStateError(msg)
 
-        runtime = 0.0
+        if self._state == RunState.REMOVED:
+            msg = "Job files were removed with the run directory. No result available."
+            raise RunnableStateError(msg)
+
+        start = time.monotonic()
         while not self.is_finished() and blocking:
             if self._state == RunState.FAILED:
                 msg = "Execution failed. No result available."
                 raise RunnableStateError(msg)
 
-            time.sleep(0.1)
-            runtime += 0.1
-
-            if 0 < timeout < runtime:
+            remaining = timeout - (time.monotonic() - start) if timeout > 0 else None
+            if remaining is not None and remaining <= 0:
                 msg = "Result not ready. Timeout reached."
                 raise TimeoutException(msg)
 
+            self._wait(remaining)
+
         if not self.is_finished() and not blocking:
             msg = "Job not finished. Result not ready."
             raise RunnableStateError(msg)
@@ -242,6 +383,103 @@ class Runnable:
 
         return self._result
 
+    async def get_async(self, timeout: float = -1) -> Any:  # noqa: ASYNC109
+        """Wait for the result of the execution without blocking the event loop.
+
+        Completion is delivered to the running event loop by the notification listener or the pool future. If
+        'timeout' is set, raises a TimeoutException if the result is not ready within the timeout period.
+        """
+        if self._state == RunState.INITIALIZED:
+            msg = "Job was not stated."
+            raise RunnableStateError(msg)
+
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+
+        def _set_done() -> None:
+            # The event loop might be closed already when a late notification arrives.
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(done.set)
+
+        self._on_done(_set_done)
+        polling = False
+
+        start = loop.time()
+        while not self.is_finished():
+            if self._state == RunState.FAILED:
+                msg = "Execution failed. No result available."
+                raise RunnableStateError(msg)
+
+            remaining = timeout - (loop.time() - start) if timeout > 0 else None
+            if remaining is not None and remaining <= 0:
+                msg = "Result not ready. Timeout reached."
+                raise TimeoutException(msg)
+
+            interval = POLL_INTERVAL if polling else self._check_interval()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(done.wait(), interval if remaining is None else min(interval, remaining))
+
+            if done.is_set():
+                # Notified, but the state file is not final yet, e.g. not visible on a network file system yet.
+                done.clear()
+                polling = True
+
+        return self.get()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        """Wait for the result of the execution in a coroutine."""
+        return self.get_async().__await__()
+
+    def _on_done(self, callback: Callable[[], None]) -> bool:
+        """Call 'callback' from any thread once the job is done.
+
+        Returns False if completion is not reported actively and the state must be polled.
+        """
+        if self._future is not None:
+            self._future.add_done_callback(lambda _: callback())
+            return True
+
+        if self._listener is not None and self.statefile is not None:
+            self._listener.add_callback(self.statefile, callback)
+            return True
+
+        return False
+
+    def _check_interval(self) -> float:
+        """Return the interval in which the state file is checked while waiting for completion.
+
+        The state file is checked rarely only if completion is reported by a pool future or by a listener which already
+        received notifications from workers.
+        """
+        if self._future is not None:
+            return NOTIFIED_POLL_INTERVAL
+        if self._listener is not None and self._listener.active:
+            return self._listener.fallback_interval
+        return POLL_INTERVAL
+
+    def _wait(self, timeout: float | None = None) -> None:
+        """Wait for a state change of the job, at most 'timeout' seconds.
+
+        Without notifications, this sleeps for a short poll interval. With notifications, this returns as soon as the
+        worker reports completion and the state file is only re-checked every few seconds as fallback, as soon as the
+        listener received any notification. Once notified, the state file is polled until it shows the final state.
+        """
+        if self._future is not None:
+            futures.wait([self._future], timeout)
+            return
+
+        if self._listener is None or self.statefile is None:
+            time.sleep(POLL_INTERVAL if timeout is None else min(POLL_INTERVAL, timeout))
+            return
+
+        if self._listener.state(self.statefile) in FINAL_STATES:
+            # Notified, but the state file is not final yet, e.g. not visible on a network file system yet.
+            time.sleep(POLL_INTERVAL if timeout is None else min(POLL_INTERVAL, timeout))
+            return
+
+        interval = self._check_interval()
+        self._listener.wait(self.statefile, interval if timeout is None else min(interval, timeout))
+
     def get_function_name(self) -> str:
         """Return the name of the wrapped function."""
         return _get_function_name(self.function)
@@ -260,3 +498,177 @@ class Runnable:
         astr = ", ".join(a)
         kwastr = ", ".join(kwa)
         return f"{fn_name}({astr}, {kwastr})"
+
+
+class BatchRunnable(Runnable):
+    """Several Runnables executed one after another by a single worker.
+
+    The batch is written to a single job file. Its members share the state of the batch and receive their individual
+    results once the batch is finished. The output of the worker is shared by all members.
+    """
+
+    def __init__(self, runnables: list[Runnable]) -> None:
+        """Initialize BatchRunnable with the Runnables to execute."""
+        self.runnables = runnables
+        super().__init__(runnables[0].function)
+        self.mmap_threshold = runnables[0].mmap_threshold
+        self.serializer = runnables[0].serializer
+        self.storage = runnables[0].storage
+
+        for runobj in self.runnables:
+            runobj._batch = self  # noqa: SLF001
+
+    @classmethod
+    def split(cls, runnables: list[Runnable], chunksize: int) -> list[Runnable]:
+        """Group Runnables into batches of 'chunksize' elements."""
+        if chunksize <= 1:
+            return runnables
+
+        batches: list[Runnable] = []
+        for start in range(0, len(runnables), chunksize):
+            chunk = runnables[start : start + chunksize]
+            batches.append(cls(chunk) if len(chunk) > 1 else chunk[0])
+        return batches
+
+    def _job_data(self) -> Any:
+        return [runobj._job_data() for runobj in self.runnables]  # noqa: SLF001
+
+    def execute(self) -> None:
+        """Prepare the batch for deployment."""
+        super().execute()
+
+        for runobj in self.runnables:
+            runobj._state = self._state  # noqa: SLF001
+            runobj._listener = self._listener  # noqa: SLF001
+            runobj.statefile = self.statefile
+
+    def _read_result_files(self) -> None:
+        if self._state != RunState.READY:
+            return
+
+        assert self.is_finished(), "Must not read results before they are ready."
+        results = self._read_job_file(self.resultfile)
+        if not isinstance(results, list):
+            results = []
+
+        out = self._read_file(self.outputfile)
+        err = self._read_file(self.errorfile)
+        state, log = self._read_status()
+
+        self._state = RunState.FINISHED if state == State.FINISHED else RunState.FAILED
+
+        for index, runobj in enumerate(self.runnables):
+            runobj._info.output = out  # noqa: SLF001
+            runobj._info.error = err  # noqa: SLF001
+            runobj._info.log = log  # noqa: SLF001
+
+            if self._state == RunState.FINISHED and index < len(results) and results[index][0] is None:
+                _, runobj._object, runobj._result = results[index]  # noqa: SLF001
+                runobj._finish()  # noqa: SLF001
+            else:
+                if index < len(results):
+                    runobj._info.error += str(results[index][0])  # noqa: SLF001
+                runobj._state = RunState.FAILED  # noqa: SLF001
+
+        self._delete_temp_files()
+
+    def __repr__(self) -> str:
+        return f"{len(self.runnables)} x {self.get_function_name()}"
+
+
+class CompletionQueue:
+    """Runnables in the order in which their executions finish.
+
+    Runnables can be added at any time. Completion is taken from worker notifications or pool futures; the state files
+    are checked in a slow interval as fallback, or in the poll interval if some Runnables can't be notified or no
+    notification arrived yet.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty CompletionQueue."""
+        self._pending: dict[int, Runnable] = {}
+        self._done: deque[Runnable] = deque()
+        self._notified: queue.SimpleQueue[Runnable] = queue.SimpleQueue()
+        self._polling = False
+        self._next_check = 0.0
+
+    def add(self, runobj: Runnable) -> None:
+        """Add a Runnable, it is returned by 'get' once it is finished."""
+        if runobj._state in (RunState.FINISHED, RunState.FAILED):  # noqa: SLF001
+            self._done.append(runobj)
+            return
+
+        self._pending[id(runobj)] = runobj
+        if not runobj._on_done(partial(self._notified.put, runobj)):  # noqa: SLF001
+            self._polling = True
+
+    def __len__(self) -> int:
+        """Return the number of Runnables not returned yet."""
+        return len(self._pending) + len(self._done)
+
+    def _check(self) -> None:
+        for key, runobj in list(self._pending.items()):
+            if runobj._state == RunState.FAILED or runobj.is_finished():  # noqa: SLF001
+                self._done.append(self._pending.pop(key))
+        intervals = [runobj._check_interval() for runobj in self._pending.values()]  # noqa: SLF001
+        interval = POLL_INTERVAL if self._polling else min(intervals, default=POLL_INTERVAL)
+        self._next_check = time.monotonic() + interval
+
+    def get(self, timeout: float = -1) -> Runnable:
+        """Return the next finished Runnable, failed Runnables are returned as well.
+
+        If 'timeout' is set, raises a TimeoutException if no Runnable finished within the timeout period.
+        """
+        if not self:
+            msg = "No Runnables left."
+            raise ValueError(msg)
+
+        start = time.monotonic()
+        while not self._done:
+            if time.monotonic() >= self._next_check:
+                self._check()
+                continue
+
+            remaining = timeout - (time.monotonic() - start) if timeout > 0 else None
+            if remaining is not None and remaining <= 0:
+                msg = "Results not ready. Timeout reached."
+                raise TimeoutException(msg)
+
+            wait = max(0.0, self._next_check - time.monotonic())
+            try:
+                runobj = self._notified.get(timeout=wait if remaining is None else min(wait, remaining))
+            except queue.Empty:
+                continue
+
+            if self._pending.get(id(runobj)) is not runobj:
+                continue
+
+            if runobj.is_finished():
+                del self._pending[id(runobj)]
+                self._done.append(runobj)
+            else:
+                # Notified, but the state file is not final yet. Poll it instead.
+                self._polling = True
+                self._next_check = min(self._next_check, time.monotonic() + POLL_INTERVAL)
+
+        return self._done.popleft()
+
+
+def as_completed(runnables: Iterable[Runnable], timeout: float = -1) -> Generator[Runnable, None, None]:
+    """Yield Runnables as soon as their execution is finished, regardless of the submission order.
+
+    Failed Runnables are yielded as well; calling 'get' on them raises the execution error. If 'timeout' is set,
+    raises a TimeoutException if not all Runnables are finished within the timeout period.
+    """
+    completion = CompletionQueue()
+    for runobj in runnables:
+        completion.add(runobj)
+
+    start = time.monotonic()
+    while completion:
+        remaining = timeout - (time.monotonic() - start) if timeout > 0 else -1
+        if timeout > 0 and remaining <= 0:
+            msg = "Results not ready. Timeout reached."
+            raise TimeoutException(msg)
+
+        yield completion.get(remaining)
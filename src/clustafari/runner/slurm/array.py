@@ -0,0 +1,52 @@
+"""Job array manifests for SlurmRunner."""
+
+import shutil
+from pathlib import Path
+
+from clustafari.utils import get_manifest_file
+
+
+class ArrayManifest:
+    """Shared manifest listing the job files of a single Slurm job array.
+
+    Line 'i' of the manifest holds the job file executed by array task 'i'.
+    """
+
+    def __init__(self, files: list[Path], directory: Path) -> None:
+        """Write manifest for the given job files to a new, empty directory."""
+        self.directory = directory
+
+        self.file = get_manifest_file(self.directory)
+        with self.file.open("w") as f:
+            f.writelines(f"{file!s}\n" for file in files)
+
+        self.size = len(files)
+
+    def array(self, parallelism: int | None = None) -> str:
+        """Return the Slurm array specification, optionally limiting concurrently running tasks."""
+        spec = f"0-{self.size - 1}"
+        if parallelism:
+            spec += f"%{parallelism}"
+        return spec
+
+    @property
+    def output_pattern(self) -> Path:
+        """Return Slurm file pattern for the standard output of array tasks."""
+        return self.directory / "%a.out"
+
+    @property
+    def error_pattern(self) -> Path:
+        """Return Slurm file pattern for the error output of array tasks."""
+        return self.directory / "%a.err"
+
+    def output_file(self, index: int) -> Path:
+        """Return the standard output file of an array task."""
+        return self.directory / f"{index}.out"
+
+    def error_file(self, index: int) -> Path:
+        """Return the error output file of an array task."""
+        return self.directory / f"{index}.err"
+
+    def __del__(self) -> None:
+        """Remove manifest and array output files."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,30 +1,72 @@
 """Cluster configuration for SlurmRunner."""
 
+from collections.abc import Iterable
 from pathlib import Path
 
 from clustafari.config import NodeConfig
-from clustafari.paths import JOB_FILE, WORKERSTUB
+from clustafari.paths import WORKERSTUB
 from clustafari.resources.resources import Resource, Resources
+from clustafari.storage import Storage
+
+from .scaler import SCALE_INTERVAL
+from .scheduler import PyslurmScheduler, Scheduler
+from .status import STATUS_INTERVAL
 
 
 class _SlurmConfig(NodeConfig):
     """Cluster configuration for SLURM."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *resources: Resource,
         runner_cls: type,
-        jobfile: Path | str = JOB_FILE,
+        jobfile: Path | str | None = None,
         workerstub: Path | str = WORKERSTUB,
+        array: bool = False,
+        array_parallelism: int | None = None,
+        max_array_size: int = 1000,
+        mmap_threshold: int | None = None,
+        status_interval: float = STATUS_INTERVAL,
+        serializer: str | None = None,
+        storage: Storage | Path | str | None = None,
+        submit_parallelism: int = 1,
+        preimport: Iterable[str] | None = None,
+        pilot: bool = False,
+        pilot_workers: int | None = None,
+        max_pilots: int = 1,
+        pilot_idle_timeout: float = 0.0,
+        scale_interval: float = SCALE_INTERVAL,
+        scheduler: Scheduler | None = None,
     ) -> None:
+        self.array = array
+        self.array_parallelism = array_parallelism
+        self.max_array_size = max_array_size
+        self.status_interval = status_interval
+        self.use_job_file = jobfile is not None
+        self.pilot = pilot
+        self.pilot_workers = pilot_workers
+        self.max_pilots = max_pilots
+        self.pilot_idle_timeout = pilot_idle_timeout
+        self.scale_interval = scale_interval
+        self.scheduler: Scheduler = scheduler or PyslurmScheduler()
+
         res = Resources(resources=resources)
         super().__init__(
             runner=runner_cls(self),
             resources=res.to_dict(),
             jobfile=jobfile,
             workerstub=workerstub,
+            mmap_threshold=mmap_threshold,
+            serializer=serializer,
+            storage=storage,
+            submit_parallelism=submit_parallelism,
+            preimport=preimport,
         )
 
+        if self.use_job_file and (self.preimport or (pilot and (pilot_workers or pilot_idle_timeout))):
+            msg = "Options 'preimport', 'pilot_workers' and 'pilot_idle_timeout' can't be passed to a custom 'jobfile'."
+            raise ValueError(msg)
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__[1:]}({self.resources})"
 
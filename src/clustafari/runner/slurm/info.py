@@ -2,9 +2,11 @@
 
 from pathlib import Path
 
-from pyslurm import Job
-
 from clustafari.runner import RunInformation
+from clustafari.utils import PILOT_RECORD, read_record
+
+from .array import ArrayManifest
+from .status import SlurmStatusCache
 
 COMMAND_TEMPLATE = r"python {} {}"
 
@@ -12,22 +14,69 @@ COMMAND_TEMPLATE = r"python {} {}"
 class SlurmInformation(RunInformation):
     """Provides information about executed slurm jobs."""
 
-    def __init__(self, jobid: int) -> None:
-        """Initialize Slurm Information with job ID."""
+    def __init__(  # noqa: PLR0913
+        self,
+        jobid: int | None,
+        array_task_id: int | None = None,
+        manifest: ArrayManifest | None = None,
+        status: SlurmStatusCache | None = None,
+        files: tuple[Path, Path] | None = None,
+        statefile: Path | None = None,
+    ) -> None:
+        """Initialize Slurm Information with job ID and, for job arrays, the array task ID.
+
+        The job information is read from the 'status' cache. If the output and error 'files' are known at submission,
+        they are used without querying Slurm. For a job file executed by one of several pilots, 'jobid' is None and
+        the job ID of the pilot is read from the 'statefile' once a pilot claimed the job file.
+        """
         super().__init__()
-        self.jobid: int = jobid
+        self._jobid = jobid
+        self.array_task_id = array_task_id
+        self.manifest = manifest
+        self.status = status or SlurmStatusCache()
+        self.files = files
+        self.statefile = statefile
+        if jobid is not None:
+            self.status.track(jobid)
+
+    @property
+    def jobid(self) -> int | None:
+        """Return the job ID, None if no pilot claimed the job file yet."""
+        if self._jobid is None and self.statefile is not None:
+            jobid = read_record(self.statefile, PILOT_RECORD)
+            if jobid is not None:
+                self._jobid = int(jobid)
+                self.status.track(self._jobid)
+        return self._jobid
 
     def debug_info(self) -> dict:
         """Get debug information of the job."""
-        job = Job.load(self.jobid)
-        return job.to_dict()
+        jobid = self.jobid
+        if jobid is None:
+            return {}
+        return self.status.get(jobid) or {}
+
+    def _output_files(self) -> tuple[Path, Path] | None:
+        if self.manifest is not None and self.array_task_id is not None:
+            return self.manifest.output_file(self.array_task_id), self.manifest.error_file(self.array_task_id)
+
+        if self.files is not None:
+            return self.files
+
+        jobid = self.jobid
+        job = None if jobid is None else self.status.get(jobid)
+        if job is None or "standard_output" not in job:
+            return None
+        return Path(job["standard_output"]), Path(job["standard_error"])
 
     @property
     def output_(self) -> str | None:
         """Get standard output of the job."""
-        job = Job.load(self.jobid)
-        out_file = Path(job.standard_output)
+        files = self._output_files()
+        if files is None:
+            return self._output
 
+        out_file, _ = files
         if out_file.exists():
             with out_file.open("r", encoding="utf-8") as f:
                 self._output = f.read()
@@ -37,9 +86,11 @@ class SlurmInformation(RunInformation):
     @property
     def error_(self) -> str | None:
         """Get error output of the job."""
-        job = Job.load(self.jobid)
-        err_file = Path(job.standard_error)
+        files = self._output_files()
+        if files is None:
+            return self._error
 
+        _, err_file = files
         if err_file.exists():
             with err_file.open("r", encoding="utf-8") as f:
                 self._error = f.read()
@@ -48,10 +99,13 @@ class SlurmInformation(RunInformation):
 
     def __del__(self) -> None:
         """Clean up output and error files on deletion."""
-        job = Job.load(self.jobid)
-        out_file = Path(job.standard_output)
-        err_file = Path(job.standard_error)
+        files = self._output_files()
+        if self._jobid is not None:
+            self.status.untrack(self._jobid)
+        if files is None:
+            return
 
+        out_file, err_file = files
         out_file.unlink(missing_ok=True)
         err_file.unlink(missing_ok=True)
 
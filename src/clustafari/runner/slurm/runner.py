@@ -2,19 +2,31 @@
 
 import logging
 import os
+import sys
+from pathlib import Path
 from typing import override
 
-from pyslurm import JobSubmitDescription
-
 from clustafari.exceptions import StateError
-from clustafari.runner import BaseRunner, RunInformation, Runnable
+from clustafari.paths import PILOT
+from clustafari.runner import BaseRunner, BatchRunnable, RunInformation, Runnable
+from clustafari.taskqueue import DirectoryQueue
 from clustafari.utils import get_error_file, get_output_file
 
+from .array import ArrayManifest
 from .config import _SlurmConfig
 from .info import SlurmInformation
+from .scaler import PilotScaler
+from .status import SlurmStatusCache, get_backend
 
 COMMAND_TEMPLATE = r"python {} {}"
 
+# Batch script running the workerstub or pilot directly with the interpreter of the calling process.
+BATCH_SCRIPT = """#!{python}
+from {module} import main
+
+main()
+"""
+
 __all__ = ["SlurmRunner"]
 
 logger = logging.getLogger(__name__)
@@ -23,16 +35,42 @@ logger = logging.getLogger(__name__)
 class SlurmRunner(BaseRunner):
     """Runs a JobLib file on a Slurm cluster."""
 
+    config: _SlurmConfig
+
     def __init__(self, config: _SlurmConfig) -> None:
         """Initialize Slurm Runner with configuration."""
-        super().__init__()
-        self.config = config
+        super().__init__(config)
         self.job_id: int | None = None
+        self.status = SlurmStatusCache(interval=config.status_interval, backend=get_backend(config.scheduler))
+
+    def _script(self, file: Path, pilot: bool = False) -> dict[str, str]:  # noqa: FBT001, FBT002
+        """Return the batch script and its arguments executing a job file, job array manifest or pilot queue.
+
+        Without a configured job file, the batch script starts the workerstub or pilot directly, without a shell
+        wrapper. A configured job file doesn't take any options, the configuration rejects them.
+        """
+        module, stub, options = "clustafari.workerstub", self.config.workerstub, self.config.worker_options()
+        if pilot:
+            module, stub = "clustafari.pilot", PILOT
+            if self.config.pilot_idle_timeout:
+                options = f"--idle-timeout {self.config.pilot_idle_timeout} {options}"
+            if self.config.pilot_workers:
+                options = f"--workers {self.config.pilot_workers} {options}"
+
+        if not self.config.use_job_file:
+            script_args = f"{options} {file!s}".strip()
+            return {"script": BATCH_SCRIPT.format(python=sys.executable, module=module), "script_args": script_args}
+
+        # TODO(Christian): make Python interpreter configurable #0001  # noqa: FIX002
+        return {
+            "script": str(self.config.job_file),
+            "script_args": f"3 {os.environ['_']} {stub!s} {file!s}",
+        }
 
     @override
     def _run(self, runobj: Runnable) -> RunInformation:
         logger.info("Execute Runner '%s'", self.__class__.__name__)
-        runobj.execute()
+        runobj.prepare()
 
         file = runobj.tempfile
         if file is None:
@@ -41,16 +79,94 @@ class SlurmRunner(BaseRunner):
         outfile = get_output_file(file)
         errfile = get_error_file(file)
 
-        # TODO(Christian): make Python interpreter configurable #0001  # noqa: FIX002
-        desc = JobSubmitDescription(
+        jobid = self.config.scheduler.submit(
             name=runobj.get_function_name(),
             standard_output=str(outfile),
             standard_error=str(errfile),
-            script=str(self.config.job_file),
-            script_args=f"3 {os.environ['_']} {self.config.workerstub!s} {file!s}",
+            **self._script(file),
             **self.config.resources,
         )
-
-        jobid = desc.submit()
-        runobj.info = SlurmInformation(jobid)
+        runobj.info = SlurmInformation(jobid, status=self.status, files=(outfile, errfile))
         return runobj.info
+
+    @override
+    def _run_many(self, runobjs: list[Runnable], chunksize: int = 1) -> list[RunInformation]:
+        runobjs = BatchRunnable.split(runobjs, chunksize)
+        if self.config.pilot:
+            return self._run_pilot(runobjs)
+        if not self.config.array or len(runobjs) < 2:  # noqa: PLR2004
+            return super()._run_many(runobjs)
+
+        infos: list[RunInformation] = []
+        size = max(1, self.config.max_array_size)
+        for start in range(0, len(runobjs), size):
+            infos.extend(self._run_array(runobjs[start : start + size]))
+        return infos
+
+    def _run_array(self, runobjs: list[Runnable]) -> list[RunInformation]:
+        """Submit all Runnables as a single Slurm job array."""
+        logger.info("Execute %d Runnables as job array with '%s'", len(runobjs), self.__class__.__name__)
+
+        for runobj in self._prepare_all(runobjs):
+            if runobj.tempfile is None:
+                raise StateError
+
+        files = [runobj.tempfile for runobj in runobjs]
+        manifest = ArrayManifest(files, self._get_storage().create_array_dir())  # type: ignore  # noqa: PGH003
+
+        jobid = self.config.scheduler.submit(
+            name=runobjs[0].get_function_name(),
+            array=manifest.array(self.config.array_parallelism),
+            standard_output=str(manifest.output_pattern),
+            standard_error=str(manifest.error_pattern),
+            **self._script(manifest.file),
+            **self.config.resources,
+        )
+        for index, runobj in enumerate(runobjs):
+            runobj.info = SlurmInformation(jobid, array_task_id=index, manifest=manifest, status=self.status)
+
+        return [runobj.info for runobj in runobjs]
+
+    def _run_pilot(self, runobjs: list[Runnable]) -> list[RunInformation]:
+        """Queue all Runnables and submit pilot jobs which execute them.
+
+        With 'max_pilots' larger than one, the number of pilots follows the number of queued job files and the job ID of
+        the pilot executing a job file is only known once the pilot claimed it.
+        """
+        logger.info("Execute %d Runnables with a pilot job with '%s'", len(runobjs), self.__class__.__name__)
+
+        for runobj in self._prepare_all(runobjs):
+            if runobj.tempfile is None:
+                raise StateError
+
+        queue = DirectoryQueue(self._get_storage().create_queue_dir())
+        queue.put(runobj.tempfile for runobj in runobjs)  # type: ignore  # noqa: PGH003
+
+        def submit() -> int:
+            return self.config.scheduler.submit(
+                name=runobjs[0].get_function_name(),
+                standard_output=str(queue.directory / "pilot-%j.out"),
+                standard_error=str(queue.directory / "pilot-%j.err"),
+                **self._script(queue.directory, pilot=True),
+                **self.config.resources,
+            )
+
+        if self.config.max_pilots > 1:
+            scaler = PilotScaler(
+                queue,
+                submit,
+                self.config.scheduler,
+                self.config.max_pilots,
+                jobs_per_pilot=self.config.pilot_workers or 1,
+                interval=self.config.scale_interval,
+            )
+            scaler.start()
+            jobid = None
+        else:
+            jobid = submit()
+
+        for runobj in runobjs:
+            files = (get_output_file(runobj.tempfile), get_error_file(runobj.tempfile))  # type: ignore  # noqa: PGH003
+            runobj.info = SlurmInformation(jobid, status=self.status, files=files, statefile=runobj.statefile)
+
+        return [runobj.info for runobj in runobjs]
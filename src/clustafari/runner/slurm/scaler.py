@@ -0,0 +1,120 @@
+"""Elastic number of pilot jobs for SlurmRunner."""
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+
+from clustafari.taskqueue import DirectoryQueue
+
+from .scheduler import PENDING, Scheduler
+
+__all__ = ["PilotScaler"]
+
+SCALE_INTERVAL = 10.0
+GRACE_PERIOD = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class PilotScaler:
+    """Submits and cancels pilot jobs to match the number of queued job files.
+
+    Every 'interval' seconds, the scaler requests one pilot per 'jobs_per_pilot' queued job files, up to 'max_pilots'
+    pilots. Pilots which still wait for an allocation are cancelled once they are not needed anymore, running pilots
+    stop by themselves after their idle timeout. The scaler stops when the queue is drained and all pilots are gone, or
+    when the queue is removed.
+
+    A submitted pilot counts as pending until the scheduler reports it. It is forgotten once the scheduler doesn't
+    report it anymore, or if the scheduler didn't report it within 'grace_period' seconds after its submission.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        queue: DirectoryQueue,
+        submit: Callable[[], int],
+        scheduler: Scheduler,
+        max_pilots: int,
+        jobs_per_pilot: int = 1,
+        interval: float = SCALE_INTERVAL,
+        grace_period: float = GRACE_PERIOD,
+    ) -> None:
+        """Initialize PilotScaler for 'queue', submitting pilots with 'submit' and monitoring them with 'scheduler'."""
+        self.queue = queue
+        self.submit = submit
+        self.scheduler = scheduler
+        self.max_pilots = max_pilots
+        self.jobs_per_pilot = max(1, jobs_per_pilot)
+        self.interval = interval
+        self.grace_period = grace_period
+        self.pilots: set[int] = set()
+        self._unseen: dict[int, float] = {}
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def scale(self) -> bool:
+        """Submit or cancel pilots once, return whether pilots or queued job files are left."""
+        try:
+            queued = len(self.queue)
+        except FileNotFoundError:
+            self._cancel_pending(len(self.pilots))
+            return False
+
+        states = self._status()
+
+        wanted = min(self.max_pilots, math.ceil(queued / self.jobs_per_pilot))
+        for _ in range(wanted - len(self.pilots)):
+            jobid = self.submit()
+            self.pilots.add(jobid)
+            self._unseen[jobid] = time.monotonic()
+
+        if len(self.pilots) > wanted:
+            self._cancel_pending(len(self.pilots) - wanted, states)
+
+        logger.debug("%d job files queued, %d pilots", queued, len(self.pilots))
+        return bool(queued or self.pilots)
+
+    def _status(self) -> dict[int, str]:
+        """Return the states of the pilots and forget the ones which are gone, unreported pilots count as pending."""
+        states = self.scheduler.status(self.pilots)
+        now = time.monotonic()
+        for jobid in list(self.pilots):
+            if jobid in states:
+                self._unseen.pop(jobid, None)
+            elif jobid in self._unseen and now - self._unseen[jobid] < self.grace_period:
+                states[jobid] = PENDING
+            else:
+                self.pilots.discard(jobid)
+                self._unseen.pop(jobid, None)
+        return states
+
+    def _cancel_pending(self, count: int, states: dict[int, str] | None = None) -> None:
+        if states is None:
+            states = self._status()
+
+        pending = sorted((jobid for jobid, state in states.items() if state == PENDING), reverse=True)
+        for jobid in pending[:count]:
+            logger.debug("Cancel pilot %d", jobid)
+            self.scheduler.cancel(jobid)
+            self.pilots.discard(jobid)
+            self._unseen.pop(jobid, None)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.scale():
+                break
+
+    def start(self) -> None:
+        """Submit the first pilots and keep scaling them in a background thread."""
+        self.scale()
+        self._thread = threading.Thread(target=self._loop, name="clustafari-pilot-scaler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop scaling, submitted pilots keep running."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
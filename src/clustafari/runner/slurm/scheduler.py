@@ -0,0 +1,148 @@
+"""Submission of batch scripts for SlurmRunner."""
+
+import itertools
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Protocol
+
+from clustafari.utils import ARRAY_TASK_ID, JOB_ID
+
+__all__ = ["PENDING", "RUNNING", "LocalScheduler", "PyslurmScheduler", "Scheduler"]
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+
+# Slurm job states of jobs which hold or are about to get an allocation.
+_ACTIVE_STATES = {"RUNNING", "CONFIGURING", "COMPLETING", "SUSPENDED", "REQUEUED", "RESIZING", "SIGNALING"}
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler(Protocol):
+    """Submits, monitors and cancels batch scripts with 'sbatch' options."""
+
+    def submit(self, **options: Any) -> int:
+        """Submit a batch script and return the job ID.
+
+        The options are the ones of 'pyslurm.JobSubmitDescription', at least 'script', 'script_args',
+        'standard_output' and 'standard_error'.
+        """
+        ...
+
+    def status(self, jobids: Iterable[int]) -> dict[int, str]:
+        """Return PENDING or RUNNING for the given jobs which are not finished yet."""
+        ...
+
+    def cancel(self, jobid: int) -> None:
+        """Cancel a job."""
+        ...
+
+
+class PyslurmScheduler:
+    """Submits batch scripts to Slurm with pyslurm."""
+
+    def submit(self, **options: Any) -> int:
+        """Submit a batch script and return the job ID."""
+        from pyslurm import JobSubmitDescription
+
+        return JobSubmitDescription(**options).submit()
+
+    def status(self, jobids: Iterable[int]) -> dict[int, str]:
+        """Return PENDING or RUNNING for the given jobs which are not finished yet."""
+        from pyslurm import Jobs
+
+        jobs = Jobs.load()
+        states = {}
+        for jobid in jobids:
+            job = jobs.get(jobid)
+            if job is None:
+                continue
+            if job.state == PENDING:
+                states[jobid] = PENDING
+            elif job.state in _ACTIVE_STATES:
+                states[jobid] = RUNNING
+        return states
+
+    def cancel(self, jobid: int) -> None:
+        """Cancel a job."""
+        from pyslurm import Job
+
+        Job(jobid).cancel()
+
+
+class LocalScheduler:
+    """Runs batch scripts as local processes, a stand-in for Slurm in tests and benchmarks.
+
+    Every job or array task is started immediately, resource options are ignored.
+    """
+
+    def __init__(self) -> None:
+        """Initialize LocalScheduler."""
+        self.processes: dict[int, list[subprocess.Popen]] = {}
+        self._jobids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._directory = Path(tempfile.mkdtemp(prefix="clustafari-scheduler-"))
+
+    def submit(self, **options: Any) -> int:
+        """Start a batch script and return the job ID."""
+        with self._lock:
+            jobid = next(self._jobids)
+
+        script = self._directory / f"{jobid}.sh"
+        content = options["script"]
+        script.write_text(content if content.startswith("#!") else Path(content).read_text())
+        script.chmod(0o755)
+        command = [str(script), *options.get("script_args", "").split()]
+
+        array = options.get("array")
+        if array is None:
+            processes = [self._start(command, options, jobid)]
+        else:
+            first, last = array.split("%")[0].split("-")
+            tasks = range(int(first), int(last) + 1)
+            processes = [self._start(command, options, jobid, task_id) for task_id in tasks]
+
+        logger.debug("Started local job %d with %d processes", jobid, len(processes))
+        with self._lock:
+            self.processes[jobid] = processes
+        return jobid
+
+    @staticmethod
+    def _start(command: list[str], options: dict[str, Any], jobid: int, task_id: int | None = None) -> subprocess.Popen:
+        env = {**os.environ, JOB_ID: str(jobid)}
+        out = str(options["standard_output"]).replace("%j", str(jobid))
+        err = str(options["standard_error"]).replace("%j", str(jobid))
+        if task_id is not None:
+            env[ARRAY_TASK_ID] = str(task_id)
+            out, err = out.replace("%a", str(task_id)), err.replace("%a", str(task_id))
+
+        with Path(out).open("w") as fout, Path(err).open("w") as ferr:
+            return subprocess.Popen(command, stdout=fout, stderr=ferr, env=env)  # noqa: S603
+
+    def status(self, jobids: Iterable[int]) -> dict[int, str]:
+        """Return RUNNING for the given jobs with processes still running, local jobs are never pending."""
+        with self._lock:
+            return {
+                jobid: RUNNING
+                for jobid in jobids
+                if any(process.poll() is None for process in self.processes.get(jobid, []))
+            }
+
+    def cancel(self, jobid: int) -> None:
+        """Terminate the processes of a job."""
+        with self._lock:
+            processes = self.processes.get(jobid, [])
+        for process in processes:
+            process.terminate()
+
+    def wait(self) -> None:
+        """Wait for all started processes."""
+        with self._lock:
+            processes = [process for job in self.processes.values() for process in job]
+        for process in processes:
+            process.wait()
@@ -0,0 +1,129 @@
+"""Cached status of submitted Slurm jobs."""
+
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+from .scheduler import PENDING, PyslurmScheduler, Scheduler
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PyslurmBackend", "SchedulerBackend", "SlurmBackend", "SlurmStatusCache", "get_backend"]
+
+STATUS_INTERVAL = 5.0
+
+
+class SlurmBackend(Protocol):
+    """Source of Slurm job information."""
+
+    def load(self, jobids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Return the information of all given jobs known to the controller."""
+        ...
+
+
+class PyslurmBackend:
+    """Loads job information with a single 'pyslurm.Jobs.load' call."""
+
+    def load(self, jobids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Return the information of all given jobs known to the controller."""
+        from pyslurm import Jobs
+
+        jobs = Jobs.load()
+        infos = {}
+        for jobid in jobids:
+            job = jobs.get(jobid)
+            if job is not None:
+                infos[jobid] = job.to_dict()
+        return infos
+
+
+class SchedulerBackend:
+    """Reports the state of jobs from 'Scheduler.status', for schedulers other than Slurm, e.g. LocalScheduler."""
+
+    def __init__(self, scheduler: Scheduler) -> None:
+        """Initialize SchedulerBackend with the scheduler the jobs were submitted to."""
+        self.scheduler = scheduler
+
+    def load(self, jobids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Return the ID and state of all given jobs which are not finished yet."""
+        return {jobid: {"job_id": jobid, "state": state} for jobid, state in self.scheduler.status(jobids).items()}
+
+
+def get_backend(scheduler: Scheduler) -> SlurmBackend:
+    """Return the backend for the information of jobs submitted to 'scheduler'."""
+    if isinstance(scheduler, PyslurmScheduler):
+        return PyslurmBackend()
+    return SchedulerBackend(scheduler)
+
+
+class SlurmStatusCache:
+    """Information of tracked Slurm jobs, refreshed for all jobs at once.
+
+    Reading the information of a job refreshes all tracked jobs in one query if the cached information is older than
+    'interval' seconds. Jobs which are not tracked anymore are not queried. Jobs tracked since the last refresh are
+    reported as pending until the next one, so submitting jobs doesn't trigger additional queries.
+
+    A job can be tracked several times, e.g. by all tasks of a job array, and is removed once it is untracked as often.
+    """
+
+    def __init__(self, interval: float = STATUS_INTERVAL, backend: SlurmBackend | None = None) -> None:
+        """Initialize SlurmStatusCache with refresh interval and backend (default: pyslurm)."""
+        self.interval = interval
+        self.backend: SlurmBackend = backend or PyslurmBackend()
+        self._jobs: dict[int, dict[str, Any] | None] = {}
+        self._references: dict[int, int] = {}
+        self._new: set[int] = set()
+        self._updated = -float("inf")
+        self._lock = threading.Lock()
+
+    def track(self, jobid: int) -> None:
+        """Include a job in the next refresh."""
+        with self._lock:
+            self._references[jobid] = self._references.get(jobid, 0) + 1
+            if jobid not in self._jobs:
+                self._jobs[jobid] = None
+                self._new.add(jobid)
+
+    def untrack(self, jobid: int) -> None:
+        """Release a job, it is removed from the cache once it is untracked as often as it was tracked."""
+        with self._lock:
+            count = self._references.get(jobid, 1) - 1
+            if count > 0:
+                self._references[jobid] = count
+                return
+
+            self._references.pop(jobid, None)
+            self._jobs.pop(jobid, None)
+            self._new.discard(jobid)
+
+    def refresh(self) -> None:
+        """Load the information of all tracked jobs."""
+        with self._lock:
+            jobids = list(self._jobs)
+            if not jobids:
+                return
+
+            logger.debug("Refresh status of %d Slurm jobs", len(jobids))
+            infos = self.backend.load(jobids)
+            for jobid in jobids:
+                if jobid in self._jobs:
+                    self._jobs[jobid] = infos.get(jobid)
+            self._new.difference_update(jobids)
+            self._updated = time.monotonic()
+
+    def get(self, jobid: int) -> dict[str, Any] | None:
+        """Return the information of a tracked job or None if the controller does not know it (anymore).
+
+        Jobs which were not refreshed since they are tracked only report their ID and a pending state.
+        """
+        if jobid not in self._jobs:
+            return None
+
+        if time.monotonic() - self._updated > self.interval:
+            self.refresh()
+
+        if jobid in self._new:
+            return {"job_id": jobid, "state": PENDING}
+        return self._jobs.get(jobid)
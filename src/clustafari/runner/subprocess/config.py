@@ -1,16 +1,42 @@
 """Cluster configuration for SubprocessRunner."""
 
+import os
+from collections.abc import Iterable
 from pathlib import Path
 
 from clustafari.config import NodeConfig
 from clustafari.paths import WORKERSTUB
+from clustafari.storage import Storage
 
 
 class _SubprocessConfig(NodeConfig):
     """Configuration for SubprocessRunner."""
 
-    def __init__(self, runner_cls: type, workerstub: Path | str = WORKERSTUB) -> None:
-        super().__init__(runner=runner_cls(self), resources={}, jobfile="", workerstub=workerstub)
+    def __init__(  # noqa: PLR0913
+        self,
+        runner_cls: type,
+        workerstub: Path | str = WORKERSTUB,
+        mmap_threshold: int | None = None,
+        pool_size: int | None = None,
+        max_concurrent: int | None = None,
+        serializer: str | None = None,
+        storage: Storage | Path | str | None = None,
+        submit_parallelism: int = 1,
+        preimport: Iterable[str] | None = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        super().__init__(
+            runner=runner_cls(self),
+            resources={},
+            jobfile="",
+            workerstub=workerstub,
+            mmap_threshold=mmap_threshold,
+            serializer=serializer,
+            storage=storage,
+            submit_parallelism=submit_parallelism,
+            preimport=preimport,
+        )
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__[1:]}({self.resources})"
@@ -0,0 +1,90 @@
+"""Asynchronous process launcher for SubprocessRunner."""
+
+import contextlib
+import logging
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+from clustafari.utils import State, get_error_file, get_output_file
+from clustafari.workerstub import StateUtils
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ProcessLauncher"]
+
+
+class ProcessLauncher:
+    """Starts one worker process per job file and limits the number of concurrently running processes.
+
+    Submitting never blocks, job files are queued until a slot is free. The standard streams of a worker process are
+    appended to the output and error files of its job, which are removed again if the process didn't write anything.
+    """
+
+    def __init__(self, command_template: str, max_concurrent: int) -> None:
+        """Initialize ProcessLauncher with worker command template and the maximum number of running processes."""
+        self.command_template = command_template
+        self.max_concurrent = max_concurrent
+        self._queue: queue.SimpleQueue[Path | None] = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._thread = threading.Thread(target=self._dispatch, name="clustafari-launcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, file: Path) -> None:
+        """Queue a job file for execution."""
+        self._queue.put(file)
+
+    def _dispatch(self) -> None:
+        while (file := self._queue.get()) is not None:
+            self._slots.acquire()
+            try:
+                process = self._start(file)
+            except OSError as err:
+                self._slots.release()
+                self._fail(file, f"Can't start worker process: {err!s}")
+                continue
+
+            threading.Thread(target=self._reap, args=(process, file), daemon=True).start()
+
+    def _start(self, file: Path) -> subprocess.Popen:
+        command = self.command_template.format(str(file)).split()
+        logger.debug("Start worker '%s'", " ".join(command))
+        with get_output_file(file).open("ab") as out, get_error_file(file).open("ab") as err:
+            return subprocess.Popen(command, stdout=out, stderr=err)  # noqa: S603
+
+    def _reap(self, process: subprocess.Popen, file: Path) -> None:
+        try:
+            code = process.wait()
+        finally:
+            self._slots.release()
+
+        self._remove_empty(file)
+        if code != 0:
+            self._fail(file, f"Worker process terminated with exit code {code}")
+
+    @staticmethod
+    def _remove_empty(file: Path) -> None:
+        for target in (get_output_file(file), get_error_file(file)):
+            # The job files might be removed already, after the results were collected.
+            with contextlib.suppress(FileNotFoundError):
+                if target.stat().st_size == 0:
+                    target.unlink()
+
+    @staticmethod
+    def _fail(file: Path, msg: str) -> None:
+        if not file.parent.exists():
+            # Results were already collected and the job files removed.
+            return
+
+        utils = StateUtils(file)
+        if utils.get_state() in (State.FAILED, State.FINISHED):
+            return
+
+        logger.warning("%s: '%s'", msg, str(file))
+        utils.set_state(State.FAILED, msg)
+
+    def close(self) -> None:
+        """Stop launching processes after the queued jobs are started."""
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,98 @@
+"""Pool of long-lived worker processes for SubprocessRunner."""
+
+import logging
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+from clustafari.utils import State
+from clustafari.workerstub import StateUtils
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["WorkerPool"]
+
+
+class WorkerPool:
+    """Long-lived worker processes executing job files from a shared queue.
+
+    Each worker runs the workerstub in '--serve' mode and is fed by its own dispatcher thread. A worker which dies is
+    restarted for the next job, the job it was executing is marked as failed.
+    """
+
+    def __init__(self, command: list[str], size: int) -> None:
+        """Initialize WorkerPool, start dispatcher threads for 'size' workers running 'command'."""
+        self.command = command
+        self.size = size
+        self._queue: queue.SimpleQueue[Path | None] = queue.SimpleQueue()
+        self._threads = [
+            threading.Thread(target=self._dispatch, name=f"clustafari-worker-{i}", daemon=True) for i in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, file: Path) -> None:
+        """Queue a job file for execution."""
+        self._queue.put(file)
+
+    def _next(self) -> Path | None:
+        """Return the next job file to execute or None to stop the worker."""
+        return self._queue.get()
+
+    def _done(self, file: Path) -> None:
+        """Handle a job file which was executed or marked as failed."""
+
+    def _start_worker(self) -> subprocess.Popen:
+        logger.debug("Start pool worker '%s'", " ".join(self.command))
+        return subprocess.Popen(  # noqa: S603
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def _dispatch(self) -> None:
+        process: subprocess.Popen | None = None
+        try:
+            while (file := self._next()) is not None:
+                if process is None or process.poll() is not None:
+                    process = self._start_worker()
+
+                if not self._execute(process, file):
+                    process = None
+                self._done(file)
+        finally:
+            if process is not None and process.stdin is not None:
+                process.stdin.close()
+                process.wait()
+
+    @staticmethod
+    def _execute(process: subprocess.Popen, file: Path) -> bool:
+        assert process.stdin is not None
+        assert process.stdout is not None
+
+        try:
+            process.stdin.write(f"{file!s}\n")
+            process.stdin.flush()
+            done = process.stdout.readline()
+        except (BrokenPipeError, OSError):
+            done = ""
+
+        if done:
+            return True
+
+        logger.warning("Pool worker terminated while executing '%s'", str(file))
+        if not file.parent.exists():
+            return False
+
+        StateUtils(file).set_state(State.FAILED, f"Worker process terminated with exit code {process.wait()}")
+        return False
+
+    def close(self) -> None:
+        """Stop all workers after the queued jobs are done."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
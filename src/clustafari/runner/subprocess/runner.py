@@ -2,36 +2,73 @@
 
 import logging
 import os
-import subprocess
 from typing import override
 
+from clustafari.exceptions import StateError
 from clustafari.runner import BaseRunner, RunInformation, Runnable
 
 from .config import _SubprocessConfig
+from .launcher import ProcessLauncher
+from .pool import WorkerPool
 
 logger = logging.getLogger(__name__)
 
-COMMAND_TEMPLATE = os.environ["_"] + r" {} {}"
+COMMAND_TEMPLATE = os.environ["_"] + r" {} {} {}"
+POOL_COMMAND_TEMPLATE = os.environ["_"] + r" {} {} --serve"
 
 __all__ = ["SubprocessRunner"]
 
 
 class SubprocessRunner(BaseRunner):
-    """Runs a JobLib file in a new Python instance."""
+    """Runs a JobLib file in a new Python instance.
+
+    Jobs are started asynchronously, at most 'max_concurrent' Python instances run at the same time. If the
+    configuration sets a 'pool_size', job files are executed by a pool of long-lived Python instances instead.
+    """
+
+    config: _SubprocessConfig
 
     def __init__(self, config: _SubprocessConfig) -> None:
         """Initialize Subprocess Runner with configuration."""
-        super().__init__()
-        self.config = config
+        super().__init__(config)
+        self._pool: WorkerPool | None = None
+        self._launcher: ProcessLauncher | None = None
+
+    def _get_pool(self) -> WorkerPool:
+        if self._pool is None:
+            command = POOL_COMMAND_TEMPLATE.format(str(self.config.workerstub), self.config.worker_options()).split()
+            self._pool = WorkerPool(command, self.config.pool_size or 1)
+        return self._pool
+
+    def _get_launcher(self) -> ProcessLauncher:
+        if self._launcher is None:
+            template = COMMAND_TEMPLATE.format(str(self.config.workerstub), self.config.worker_options(), "{}")
+            self._launcher = ProcessLauncher(template, self.config.max_concurrent)
+        return self._launcher
+
+    def close(self) -> None:
+        """Stop the worker pool and process launcher, if any, after all queued jobs are started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+        if self._launcher is not None:
+            self._launcher.close()
+            self._launcher = None
 
     @override
     def _run(self, runobj: Runnable) -> RunInformation:
         logger.info("Execute Runner '%s'", self.__class__.__name__)
-        runobj.execute()
+        runobj.prepare()
         info = RunInformation()
 
         file = runobj.tempfile
-        command = COMMAND_TEMPLATE.format(str(self.config.workerstub), str(file)).split()
-        info.output = str(subprocess.run(command, capture_output=True, check=True))  # noqa: S603
+        if file is None:
+            raise StateError
+
+        if self.config.pool_size:
+            self._get_pool().submit(file)
+        else:
+            self._get_launcher().submit(file)
 
         return info
@@ -0,0 +1,179 @@
+"""Serialization of job and result files.
+
+Every file starts with a header line naming the serializer it was written with, e.g. '#clustafari:joblib:lz4:3'. The
+worker reads the header, loads the job with the matching serializer and writes the result with the same one. Files
+without header are loaded with joblib.
+
+Available serializers:
+
+- 'joblib[:<compressor>[:<level>]]': joblib pickles, optionally compressed with one of joblib's compressors ('zlib',
+  'gzip', 'bz2', 'lzma', 'xz' or 'lz4').
+- 'cloudpickle': cloudpickle, which also serializes lambdas and interactively defined functions by value.
+- 'pickle5': pickle protocol 5 with out-of-band buffers. Large buffers like NumPy arrays are written and read as raw
+  bytes without copying them into the pickle stream.
+"""
+
+import abc
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO
+
+__all__ = ["DEFAULT_SERIALIZER", "Serializer", "dump", "get_serializer", "load", "read_spec"]
+
+DEFAULT_SERIALIZER = "joblib"
+HEADER = b"#clustafari:"
+MAX_LEVEL = 9
+
+_SIZE = struct.Struct("<Q")
+
+
+class Serializer(abc.ABC):
+    """Writes and reads objects to and from binary files."""
+
+    @abc.abstractmethod
+    def dump(self, obj: Any, f: BinaryIO) -> None:
+        """Write an object to a binary file."""
+
+    @abc.abstractmethod
+    def load(self, f: BinaryIO) -> Any:
+        """Read an object from a binary file."""
+
+
+class JoblibSerializer(Serializer):
+    """Serializer using joblib with optional compression."""
+
+    def __init__(self, compress: str | None = None, level: int | None = None) -> None:
+        """Initialize JoblibSerializer with compressor name and level."""
+        self.compress = compress
+        self.level = level
+
+    def dump(self, obj: Any, f: BinaryIO) -> None:
+        """Write an object to a binary file."""
+        import joblib
+
+        compress: Any = 0
+        if self.compress is not None:
+            compress = (self.compress, self.level) if self.level is not None else self.compress
+        joblib.dump(obj, f, compress=compress)
+
+    def load(self, f: BinaryIO) -> Any:
+        """Read an object from a binary file."""
+        import joblib
+
+        # joblib detects the compressor itself.
+        return joblib.load(f)
+
+
+class CloudpickleSerializer(Serializer):
+    """Serializer using cloudpickle."""
+
+    def dump(self, obj: Any, f: BinaryIO) -> None:
+        """Write an object to a binary file."""
+        try:
+            import cloudpickle
+        except ImportError:
+            from joblib.externals import cloudpickle  # type: ignore  # noqa: PGH003
+
+        cloudpickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, f: BinaryIO) -> Any:
+        """Read an object from a binary file."""
+        return pickle.load(f)  # noqa: S301
+
+
+class Pickle5Serializer(Serializer):
+    """Serializer using pickle protocol 5 with out-of-band buffers."""
+
+    def dump(self, obj: Any, f: BinaryIO) -> None:
+        """Write an object to a binary file."""
+        buffers: list[pickle.PickleBuffer] = []
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+
+        f.write(_SIZE.pack(len(data)))
+        f.write(data)
+        f.write(_SIZE.pack(len(buffers)))
+        for buffer in buffers:
+            raw = buffer.raw()
+            f.write(_SIZE.pack(raw.nbytes))
+            f.write(raw)
+
+    def load(self, f: BinaryIO) -> Any:
+        """Read an object from a binary file."""
+        (size,) = _SIZE.unpack(f.read(_SIZE.size))
+        data = f.read(size)
+
+        (count,) = _SIZE.unpack(f.read(_SIZE.size))
+        buffers = []
+        for _ in range(count):
+            (size,) = _SIZE.unpack(f.read(_SIZE.size))
+            buffer = bytearray(size)
+            f.readinto(buffer)  # type: ignore  # noqa: PGH003
+            buffers.append(buffer)
+
+        return pickle.loads(data, buffers=buffers)  # noqa: S301
+
+
+def get_serializer(spec: str | None) -> Serializer:
+    """Return the serializer for a specification like 'joblib:lz4:3', 'cloudpickle' or 'pickle5'."""
+    name, *options = (spec or DEFAULT_SERIALIZER).split(":")
+
+    if name == "joblib" and len(options) <= 2:  # noqa: PLR2004
+        compress = options[0] if options else None
+        level = options[1] if len(options) > 1 else None
+        _check_compression(spec, compress, level)
+        return JoblibSerializer(compress, int(level) if level is not None else None)
+    if name == "cloudpickle" and not options:
+        return CloudpickleSerializer()
+    if name == "pickle5" and not options:
+        return Pickle5Serializer()
+
+    msg = f"Unknown serializer '{spec}'."
+    raise ValueError(msg)
+
+
+def _check_compression(spec: str | None, compress: str | None, level: str | None) -> None:
+    """Check that joblib supports the compressor and level of a specification and the compressor is installed."""
+    if compress is None:
+        return
+
+    from joblib.compressor import _COMPRESSORS
+
+    compressor = _COMPRESSORS.get(compress)
+    if compressor is None:
+        msg = f"Unknown serializer '{spec}': compressor must be one of {sorted(_COMPRESSORS)}."
+        raise ValueError(msg)
+    if getattr(compressor, "fileobj_factory", None) is None:
+        msg = f"Unknown serializer '{spec}': module of compressor '{compress}' is not installed."
+        raise ValueError(msg)
+    if level is not None and (not level.isdigit() or int(level) > MAX_LEVEL):
+        msg = f"Unknown serializer '{spec}': compression level must be between 0 and {MAX_LEVEL}."
+        raise ValueError(msg)
+
+
+def read_spec(file: Path) -> str:
+    """Return the serializer specification recorded in a file."""
+    with file.open("rb") as f:
+        return _read_header(f)
+
+
+def _read_header(f: BinaryIO) -> str:
+    if f.read(len(HEADER)) != HEADER:
+        f.seek(0)
+        return DEFAULT_SERIALIZER
+    return f.readline().decode().strip()
+
+
+def dump(obj: Any, file: Path, spec: str | None = None) -> None:
+    """Write an object and the serializer specification to a file."""
+    spec = spec or DEFAULT_SERIALIZER
+    serializer = get_serializer(spec)
+    with file.open("wb") as f:
+        f.write(HEADER + spec.encode() + b"\n")
+        serializer.dump(obj, f)
+
+
+def load(file: Path) -> Any:
+    """Read an object from a file with the serializer recorded in it."""
+    with file.open("rb") as f:
+        return get_serializer(_read_header(f)).load(f)
@@ -0,0 +1,106 @@
+"""Location of job, state and result files."""
+
+import contextlib
+import logging
+import os
+import shutil
+import uuid
+from contextvars import ContextVar, Token
+from pathlib import Path
+
+from clustafari.paths import CLUSTAFARI_DIR
+
+__all__ = ["STORAGE_ENV", "Storage", "enter_run", "exit_run", "get_storage"]
+
+STORAGE_ENV = "CLUSTAFARI_STORAGE"
+
+logger = logging.getLogger(__name__)
+
+
+class Storage:
+    """Directory tree holding the files of submitted jobs.
+
+    Every job gets its own directory below 'root'. All other files of a job (state, output, result, ...) are placed
+    next to its job file, so workers only need the path of the job file. The root defaults to the environment variable
+    'CLUSTAFARI_STORAGE' or '~/.clustafari'. It must be visible to the workers, e.g. a scratch file system for Slurm
+    jobs or a node-local tmpfs like '/dev/shm' for local runners.
+
+    With 'sharded', job directories are grouped into 256 subdirectories by the first two characters of their name,
+    which keeps single directories small on network file systems.
+    """
+
+    def __init__(self, root: Path | str | None = None, sharded: bool = False) -> None:  # noqa: FBT001, FBT002
+        """Initialize Storage with root directory and layout."""
+        self.root = Path(root or os.environ.get(STORAGE_ENV) or CLUSTAFARI_DIR).expanduser().resolve()
+        self.sharded = sharded
+
+    @property
+    def store_dir(self) -> Path:
+        """Return the directory of objects shared by several jobs."""
+        return self.root / "store"
+
+    def job_dir(self, name: str) -> Path:
+        """Return the directory of a job."""
+        if self.sharded:
+            return self.root / name[:2] / name
+        return self.root / name
+
+    def create_job_dir(self, name: str) -> Path:
+        """Create the directory of a job and return it."""
+        directory = self.job_dir(name)
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def create_array_dir(self) -> Path:
+        """Create a new directory for the files shared by a job array and return it."""
+        directory = self.root / f"array-{uuid.uuid4().hex}"
+        directory.mkdir(parents=True)
+        return directory
+
+    def create_queue_dir(self) -> Path:
+        """Create a new directory for a queue of job files and return it."""
+        directory = self.root / f"queue-{uuid.uuid4().hex}"
+        directory.mkdir(parents=True)
+        return directory
+
+    def create_run(self) -> "Storage":
+        """Create a new run directory and return a Storage with the same layout inside it.
+
+        All files of a run can be removed at once with 'remove'.
+        """
+        directory = self.root / f"run-{uuid.uuid4().hex}"
+        directory.mkdir(parents=True)
+        return Storage(directory, sharded=self.sharded)
+
+    def remove(self) -> None:
+        """Remove the root directory and everything in it."""
+        logger.debug("Remove storage '%s'", str(self.root))
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.root!s}, sharded={self.sharded})"
+
+
+_runs: ContextVar[dict[Storage, Storage]] = ContextVar("clustafari_runs", default={})  # noqa: B039
+
+
+def enter_run(storage: Storage) -> tuple[Storage, Token]:
+    """Create a run directory which replaces 'storage' in the current thread or task and the ones it starts.
+
+    Returns the run storage and the token to pass to 'exit_run'.
+    """
+    run = storage.create_run()
+    return run, _runs.set({**_runs.get(), storage: run})
+
+
+def exit_run(run: Storage, token: Token) -> None:
+    """Stop using a run directory and remove all its files."""
+    with contextlib.suppress(ValueError):
+        # Exited in another context than entered, the run ends with that context anyway.
+        _runs.reset(token)
+    run.remove()
+
+
+def get_storage(storage: Storage) -> Storage:
+    """Return the run directory that replaces 'storage' in the current context or 'storage' itself."""
+    return _runs.get().get(storage, storage)
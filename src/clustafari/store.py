@@ -0,0 +1,111 @@
+"""Content-addressed store for objects shared by many jobs."""
+
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from clustafari.paths import CLUSTAFARI_DIR
+from clustafari.serialization import dump, load
+
+__all__ = ["SharedObject"]
+
+STORE_DIR = CLUSTAFARI_DIR / "store"
+CACHE_SIZE = 16
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_references: dict[Path, int] = {}
+_cache: OrderedDict[str, Any] = OrderedDict()
+
+
+def _get_key(obj: Any) -> str:
+    import joblib
+
+    try:
+        return joblib.hash(obj) or uuid.uuid4().hex
+    except Exception:  # noqa: BLE001
+        logger.debug("Can't hash shared object, store it without deduplication.")
+        return uuid.uuid4().hex
+
+
+class SharedObject:
+    """Reference to an object which is serialized only once, no matter how many jobs use it.
+
+    The object is written to the store when the reference is pickled the first time. Every further pickled copy only
+    contains the key of the object. Workers load the object from the store on first use and keep it in a small
+    per-process cache. The stored file is removed once the last reference in the calling process is gone.
+
+    The object is written with the 'serializer' specification (see 'clustafari.serialization'), default: joblib.
+    """
+
+    def __init__(self, obj: Any, directory: Path = STORE_DIR, serializer: str | None = None) -> None:
+        """Initialize SharedObject by computing the content key of the object."""
+        self.key = _get_key(obj)
+        self.file = directory / f"{self.key}.joblib"
+        self.serializer = serializer
+        self._obj = obj
+        self._owner = True
+
+        with _lock:
+            _references[self.file] = _references.get(self.file, 0) + 1
+
+    def _store(self) -> None:
+        with _lock:
+            if self.file.exists():
+                return
+
+            logger.debug("Store shared object '%s'", self.key)
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            tmpfile = self.file.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            dump(self._obj, tmpfile, self.serializer)
+            tmpfile.replace(self.file)
+
+    def load(self) -> Any:
+        """Return the shared object, load it from the store if necessary."""
+        if self._owner:
+            return self._obj
+
+        with _lock:
+            if self.key in _cache:
+                _cache.move_to_end(self.key)
+                return _cache[self.key]
+
+        obj = load(self.file)
+        with _lock:
+            _cache[self.key] = obj
+            if len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+        return obj
+
+    def __getstate__(self) -> dict:
+        """Store the object on first use and pickle only the reference."""
+        if self._owner:
+            self._store()
+        return {"key": self.key, "file": os.fspath(self.file), "serializer": self.serializer}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the reference, the object is loaded lazily."""
+        self.key = state["key"]
+        self.file = Path(state["file"])
+        self.serializer = state.get("serializer")
+        self._obj = None
+        self._owner = False
+
+    def __del__(self) -> None:
+        """Remove the stored object once the last reference is gone."""
+        if not getattr(self, "_owner", False):
+            return
+
+        with _lock:
+            count = _references.get(self.file, 1) - 1
+            if count > 0:
+                _references[self.file] = count
+                return
+
+            _references.pop(self.file, None)
+            self.file.unlink(missing_ok=True)
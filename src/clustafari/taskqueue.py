@@ -0,0 +1,183 @@
+"""Queue of job files in a shared directory, used by pilot processes and QueueRunner."""
+
+import contextlib
+import logging
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from pathlib import Path
+
+from clustafari.utils import State, get_status_file, read_status
+from clustafari.workerstub import StateUtils
+
+__all__ = ["DirectoryQueue"]
+
+POLL_INTERVAL = 0.5
+MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryQueue:
+    """Queue of job files, shared by processes through a directory.
+
+    Every queued job file is a ticket in 'pending', holding the path of the job file. A consumer claims a ticket by
+    renaming it to 'claimed', which succeeds for exactly one consumer even on shared file systems. Tickets are claimed
+    roughly in the order they were queued.
+
+    A claimed ticket is a lease: its consumer renews it with 'heartbeat' and removes it with 'complete' once the job is
+    done. With a 'lease_timeout', consumers which find the queue empty move tickets whose lease was not renewed for that
+    many seconds back to 'pending', so jobs of dead workers are executed by others. A job is given up and marked as
+    failed after 'max_attempts' lost leases. Jobs are executed at least once, a worker which misses its heartbeats but
+    is still alive may execute a job a second time.
+    """
+
+    def __init__(self, directory: Path, lease_timeout: float | None = None, max_attempts: int = MAX_ATTEMPTS) -> None:
+        """Initialize DirectoryQueue in 'directory', creating it if necessary."""
+        self.directory = Path(directory)
+        self.pending = self.directory / "pending"
+        self.claimed = self.directory / "claimed"
+        self.pending.mkdir(parents=True, exist_ok=True)
+        self.claimed.mkdir(exist_ok=True)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        self._candidates: deque[str] = deque()
+        self._leases: dict[Path, Path] = {}
+        self._next_requeue = 0.0
+        self._lock = threading.Lock()
+
+    def _write_ticket(self, name: str, file: Path, attempt: int = 0) -> None:
+        tmpfile = self.directory / f"{name}.tmp"
+        tmpfile.write_text(f"{file!s}\n{attempt}")
+        tmpfile.replace(self.pending / name)
+
+    @staticmethod
+    def _read_ticket(ticket: Path) -> tuple[Path, int]:
+        file, _, attempt = ticket.read_text().partition("\n")
+        return Path(file), int(attempt or 0)
+
+    def put(self, files: Iterable[Path]) -> None:
+        """Queue job files."""
+        for file in files:
+            self._write_ticket(f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}", file)
+
+    def _claim_next(self) -> Path | None:
+        with self._lock:
+            if not self._candidates:
+                self._candidates.extend(sorted(ticket.name for ticket in self.pending.iterdir()))
+
+            while self._candidates:
+                name = self._candidates.popleft()
+                ticket = self.claimed / name
+                try:
+                    (self.pending / name).rename(ticket)
+                except FileNotFoundError:
+                    # Claimed by another consumer.
+                    continue
+
+                file, _ = self._read_ticket(ticket)
+                self._leases[file] = ticket
+                return file
+
+        return None
+
+    def heartbeat(self) -> None:
+        """Renew the leases of all job files claimed by this queue object and not completed yet."""
+        with self._lock:
+            tickets = list(self._leases.values())
+
+        for ticket in tickets:
+            # A missing ticket was requeued by another consumer.
+            with contextlib.suppress(FileNotFoundError):
+                ticket.touch(exist_ok=True)
+
+    def complete(self, file: Path) -> None:
+        """Remove the lease of a claimed job file after it was executed."""
+        with self._lock:
+            ticket = self._leases.pop(file, None)
+        if ticket is not None:
+            ticket.unlink(missing_ok=True)
+
+    def requeue_expired(self) -> int:
+        """Move tickets with expired leases back to the queue, return the number of requeued job files."""
+        if self.lease_timeout is None:
+            return 0
+
+        with self._lock:
+            own = set(self._leases.values())
+
+        requeued = 0
+        now = time.time()
+        for ticket in self.claimed.iterdir():
+            try:
+                expired = now - ticket.stat().st_mtime > self.lease_timeout
+            except FileNotFoundError:
+                continue
+            if not expired or ticket in own:
+                continue
+
+            # Only the consumer which manages to rename the ticket requeues it.
+            stolen = self.directory / f"{ticket.name}.requeue"
+            try:
+                ticket.rename(stolen)
+            except FileNotFoundError:
+                continue
+
+            requeued += self._requeue(stolen, ticket.name)
+        return requeued
+
+    def _requeue(self, stolen: Path, name: str) -> int:
+        file, attempt = self._read_ticket(stolen)
+        state, _ = read_status(get_status_file(file))
+        try:
+            if not file.exists() or state in {State.FINISHED, State.FAILED}:
+                logger.debug("Drop expired lease of finished job file '%s'", str(file))
+                return 0
+
+            if attempt + 1 >= self.max_attempts:
+                logger.warning("Job file '%s' lost its worker %d times, give up", str(file), attempt + 1)
+                StateUtils(file).set_state(State.FAILED, f"Worker lost {attempt + 1} times")
+                return 0
+
+            # A new name per attempt keeps the lost worker from renewing or completing the new lease.
+            logger.info("Requeue job file '%s' of a lost worker", str(file))
+            self._write_ticket(f"{name.partition('.')[0]}.{attempt + 1}", file, attempt + 1)
+            return 1
+        finally:
+            stolen.unlink(missing_ok=True)
+
+    def claim(self, timeout: float = 0.0) -> Path | None:
+        """Claim the next job file, wait up to 'timeout' seconds for one.
+
+        Return None if the queue stays empty or was removed.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                file = self._claim_next()
+                if file is None and self.lease_timeout is not None and time.monotonic() >= self._next_requeue:
+                    self._next_requeue = time.monotonic() + self.lease_timeout / 4
+                    if self.requeue_expired():
+                        file = self._claim_next()
+            except FileNotFoundError:
+                logger.debug("Queue '%s' was removed", str(self.directory))
+                return None
+            if file is not None:
+                logger.debug("Claimed job file '%s'", str(file))
+                return file
+
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    def __len__(self) -> int:
+        """Return the number of queued, unclaimed job files."""
+        return sum(1 for _ in self.pending.iterdir())
+
+    def remove(self) -> None:
+        """Remove the queue directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,74 @@
+"""Memory-mapped transport of large NumPy arrays.
+
+Arrays above a size threshold are not pickled into job and result files. Instead, each array is written to its own
+'.npy' file next to the job file and replaced by an ArrayRef. The receiving side opens these files as read-only memory
+maps, so arrays are neither copied into the pickle stream nor fully loaded into memory.
+"""
+
+import itertools
+import sys
+from pathlib import Path
+from typing import Any
+
+__all__ = ["ArrayRef", "externalize", "resolve"]
+
+MMAP_MODE = "r"
+
+
+class ArrayRef:
+    """Reference to a NumPy array stored in a '.npy' file."""
+
+    def __init__(self, file: Path, mmap_mode: str | None = MMAP_MODE) -> None:
+        """Initialize ArrayRef with path to the '.npy' file."""
+        self.file = Path(file)
+        self.mmap_mode = mmap_mode
+
+    def load(self) -> Any:
+        """Open the referenced array as memory map."""
+        import numpy as np
+
+        return np.load(self.file, mmap_mode=self.mmap_mode)  # type: ignore  # noqa: PGH003
+
+    def __repr__(self) -> str:
+        return f"ArrayRef({self.file!s})"
+
+
+def externalize(obj: Any, directory: Path, threshold: int | None, prefix: str) -> Any:
+    """Replace arrays with at least 'threshold' bytes by ArrayRefs.
+
+    Descends into tuples, lists and dictionaries. The arrays are saved as '<prefix>-<n>.npy' in 'directory'.
+    """
+    numpy = sys.modules.get("numpy")
+    if threshold is None or numpy is None:
+        # Without numpy being imported, there can't be any arrays.
+        return obj
+
+    counter = itertools.count()
+
+    def _externalize(item: Any) -> Any:
+        if isinstance(item, numpy.ndarray) and item.nbytes >= threshold and not item.dtype.hasobject:
+            file = directory / f"{prefix}-{next(counter)}.npy"
+            numpy.save(file, item, allow_pickle=False)
+            return ArrayRef(file)
+        if type(item) is tuple:
+            return tuple(_externalize(i) for i in item)
+        if type(item) is list:
+            return [_externalize(i) for i in item]
+        if type(item) is dict:
+            return {k: _externalize(v) for k, v in item.items()}
+        return item
+
+    return _externalize(obj)
+
+
+def resolve(obj: Any) -> Any:
+    """Replace ArrayRefs by memory-mapped arrays. Descends into tuples, lists and dictionaries."""
+    if isinstance(obj, ArrayRef):
+        return obj.load()
+    if type(obj) is tuple:
+        return tuple(resolve(i) for i in obj)
+    if type(obj) is list:
+        return [resolve(i) for i in obj]
+    if type(obj) is dict:
+        return {k: resolve(v) for k, v in obj.items()}
+    return obj
@@ -1,6 +1,9 @@
 """Utility functions for PyClustafari."""
 
+import contextlib
+import json
 import logging
+import os
 import sys
 from collections.abc import Generator
 from contextlib import contextmanager
@@ -10,6 +13,13 @@ from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
+JOB_ID = "SLURM_JOB_ID"
+ARRAY_TASK_ID = "SLURM_ARRAY_TASK_ID"
+
+STATE_RECORD = "state"
+LOG_RECORD = "log"
+PILOT_RECORD = "pilot"
+
 
 @contextmanager
 def redirect_io(
@@ -64,11 +74,78 @@ def get_error_file(file: Path) -> Path:
     return file.with_suffix(".err")
 
 
-def get_log_file(file: Path) -> Path:
-    """Return path to log file for a given job file."""
-    return file.with_suffix(".log")
+def get_status_file(file: Path) -> Path:
+    """Return path to status file for a given job file."""
+    return file.with_suffix(".status")
+
+
+def append_status(file: Path, records: list[tuple[str, str]]) -> None:
+    """Append state and log records to a status file with a single write.
 
+    Each record is a line with its kind ('state', 'log' or 'pilot'), a tab and the text as JSON string.
+    """
+    with file.open("a") as f:
+        f.write("".join(f"{kind}\t{json.dumps(text)}\n" for kind, text in records))
 
-def get_state_file(file: Path) -> Path:
-    """Return path to state file for a given job file."""
-    return file.with_suffix(".state")
+
+def read_status(file: Path) -> tuple[State, str]:
+    """Return the last recorded state and the log of a status file."""
+    try:
+        with file.open("r") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return State.IDLE, ""
+
+    state = State.IDLE
+    log = []
+    for line in lines:
+        kind, _, text = line.partition("\t")
+        try:
+            text = json.loads(text)
+        except json.JSONDecodeError:
+            # Incomplete record of a concurrent write.
+            continue
+
+        if kind == STATE_RECORD:
+            state = State(text)
+        elif kind == LOG_RECORD:
+            log.append(text)
+
+    return state, "".join(f"{line}\n" for line in log)
+
+
+def read_record(file: Path, kind: str) -> str | None:
+    """Return the text of the last record of a kind in a status file, None if there is none."""
+    try:
+        with file.open("r") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return None
+
+    text = None
+    for line in lines:
+        record, _, value = line.partition("\t")
+        if record == kind:
+            with contextlib.suppress(json.JSONDecodeError):
+                text = json.loads(value)
+    return text
+
+
+def get_manifest_file(directory: Path) -> Path:
+    """Return path to the job array manifest in a given directory."""
+    return directory / "jobs.manifest"
+
+
+def resolve_job_file(file: Path) -> Path:
+    """Return the job file of the current array task if 'file' is a job array manifest."""
+    if file.suffix != ".manifest":
+        return file
+
+    index = int(os.environ[ARRAY_TASK_ID])
+    with file.open("r") as f:
+        for i, line in enumerate(f):
+            if i == index:
+                return Path(line.strip())
+
+    msg = f"Array task {index} not listed in manifest '{file}'."
+    raise IndexError(msg)
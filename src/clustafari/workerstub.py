@@ -1,102 +1,238 @@
 """Stub for loading JobLib files and executing them."""
 
 import argparse
+import importlib
+import io
+import itertools
+import os
 import pathlib
+import sys
 from pathlib import Path
 from typing import Any
 
-import joblib
-
+from clustafari.notify import notify
+from clustafari.serialization import dump, load, read_spec
+from clustafari.store import SharedObject
+from clustafari.transport import externalize, resolve
 from clustafari.utils import (
+    LOG_RECORD,
+    STATE_RECORD,
     State,
+    append_status,
     get_error_file,
-    get_log_file,
     get_output_file,
     get_result_file,
-    get_state_file,
+    get_status_file,
+    read_status,
     redirect_io,
+    resolve_job_file,
 )
 
+_result_counter = itertools.count()
 
-class StateUtils:
-    """Manage execution state and logs."""
+
+class LazyFile(io.TextIOBase):
+    """Text file opened for appending on first write, so jobs without output don't create files."""
 
     def __init__(self, file: Path) -> None:
-        """Initialize state utils for a particular job execution."""
+        """Initialize LazyFile with path of the file."""
         self.file = file
+        self._f: io.TextIOBase | None = None
 
-        self.statefile = get_state_file(file)
-        self.statefile.touch(exist_ok=True)
+    def _open(self) -> io.TextIOBase:
+        if self._f is None:
+            self._f = self.file.open("a")
+        return self._f
 
-        self.outfile = get_output_file(file)
-        self.outfile.touch(exist_ok=True)
+    def write(self, s: str) -> int:
+        """Write text to the file."""
+        if not s:
+            return 0
+        return self._open().write(s)
+
+    def fileno(self) -> int:
+        """Return the file descriptor, opening the file."""
+        return self._open().fileno()
+
+    def flush(self) -> None:
+        """Flush the file, if opened."""
+        if self._f is not None:
+            self._f.flush()
+
+    def close(self) -> None:
+        """Close the file, if opened."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        super().close()
+
+
+class StateUtils:
+    """Manage execution state and logs.
+
+    State transitions and log messages are appended to a single status file. Output files are only created when the
+    executed functions write to them.
+    """
 
+    def __init__(self, file: Path) -> None:
+        """Initialize state utils for a particular job execution."""
+        self.file = file
+        self.statefile = get_status_file(file)
+        self.outfile = get_output_file(file)
         self.errfile = get_error_file(file)
-        self.errfile.touch(exist_ok=True)
 
-        self.logfile = get_log_file(file)
-        self.logfile.touch(exist_ok=True)
+    def get_state(self) -> State:
+        """Return current execution state."""
+        state, _ = read_status(self.statefile)
+        return state
 
-    def set_state(self, state: State) -> None:
-        """Set current execution state."""
-        with self.statefile.open("w") as f:
-            f.write(str(state))
+    def set_state(self, state: State, msg: str | None = None) -> None:
+        """Set current execution state, optionally logging a message first."""
+        records = [(LOG_RECORD, msg)] if msg is not None else []
+        append_status(self.statefile, [*records, (STATE_RECORD, str(state))])
+        notify(self.statefile, state)
 
     def log(self, msg: str) -> None:
-        """Write log message to logfile."""
-        with self.logfile.open("a") as f:
-            f.write(msg)
-            f.write("\n")
+        """Write log message to the status file."""
+        append_status(self.statefile, [(LOG_RECORD, msg)])
+
+
+def _call(fn: Any, args: Any, kwargs: Any, options: dict, utils: StateUtils) -> tuple[Any, Any]:
+    if isinstance(fn, SharedObject):
+        fn = fn.load()
+
+    threshold = options.get("mmap_threshold")
+    if threshold is not None:
+        args, kwargs = resolve((args, kwargs))
+
+    fnobj = None
+    if hasattr(fn, "__self__"):
+        fnobj = fn.__self__
+
+    with (
+        LazyFile(utils.outfile) as out,
+        LazyFile(utils.errfile) as err,
+        redirect_io(out, err),  # type: ignore  # noqa: PGH003
+    ):
+        result = fn(*args, **kwargs)
+
+    prefix = f"result-{next(_result_counter)}"
+    return fnobj, externalize(result, utils.file.parent, threshold, prefix=prefix)
+
+
+def _call_batch(calls: list[tuple[Any, Any, Any, dict]], utils: StateUtils) -> list[tuple[str | None, Any, Any]]:
+    """Execute a batch of calls. A failing call does not abort the remaining calls."""
+    results: list[tuple[str | None, Any, Any]] = []
+    for index, (fn, args, kwargs, options) in enumerate(calls):
+        try:
+            fnobj, result = _call(fn, args, kwargs, options, utils)
+        except Exception as e:  # noqa: BLE001
+            utils.log(f"Call {index} failed: {e!s}")
+            results.append((str(e), None, None))
+        else:
+            results.append((None, fnobj, result))
+    return results
 
 
 def execute(arguments: Any) -> None:
     """Execute serialized  functions with provided arguments."""
-    file = Path(arguments.filename).expanduser().resolve()
-    result = None
-    fnobj = None
+    file = resolve_job_file(Path(arguments.filename).expanduser().resolve())
 
     utils = StateUtils(file)
-    utils.set_state(State.STARTED)
+    state = State.FAILED
 
     try:
-        utils.log("Load job file")
-        utils.set_state(State.LOAD_FILE)
-        fn, args, kwargs = joblib.load(file)
-        if hasattr(fn, "__self__"):
-            fnobj = fn.__self__
-
-        utils.log("Start execution")
-        utils.set_state(State.RUNNING)
-
-        with (
-            utils.outfile.open("a") as out,
-            utils.errfile.open("a") as err,
-            redirect_io(out, err),
-        ):
-            result = fn(*args, **kwargs)
-        utils.log("Write output")
-        utils.set_state(State.DUMP_RESULT)
-        joblib.dump((fnobj, result), get_result_file(file))
+        utils.set_state(State.LOAD_FILE, "Load job file")
+        spec = read_spec(file)
+        data = load(file)
+
+        utils.set_state(State.RUNNING, "Start execution")
+
+        if isinstance(data, list):
+            results: Any = _call_batch(data, utils)
+        else:
+            results = _call(*data, utils)
+
+        utils.set_state(State.DUMP_RESULT, "Write output")
+        dump(results, get_result_file(file), spec)
         utils.log("Execution finished")
-        utils.set_state(State.FINISHED)
+        state = State.FINISHED
     except Exception as e:  # noqa: BLE001
         utils.log(str(e))
-        utils.set_state(State.FAILED)
     finally:
-        utils.log("Workerstub terminated")
+        # The final state must be the last write, the caller removes the files as soon as it sees it.
+        utils.set_state(state, "Workerstub terminated")
+
+
+def preimport(modules: list[str]) -> None:
+    """Import modules before the first job is loaded, a module which can't be imported is skipped."""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:  # noqa: BLE001
+            sys.stderr.write(f"Failed to preimport '{module}': {e!s}\n")
+
+
+def serve() -> None:
+    """Execute job files read line by line from stdin until stdin is closed.
+
+    After each job, the job file is written to stdout to signal that the worker is ready for the next one. Output of
+    the executed functions that bypasses the redirection is sent to stderr, so it can't interfere with this protocol.
+    """
+    ready = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
 
+    for line in sys.stdin:
+        filename = line.strip()
+        if not filename:
+            continue
 
-def parse_arguments() -> argparse.Namespace:
+        try:
+            execute(argparse.Namespace(filename=filename))
+        except Exception as e:  # noqa: BLE001
+            sys.stderr.write(f"Failed to execute '{filename}': {e!s}\n")
+        ready.write(f"{filename}\n")
+        ready.flush()
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse commandline arguments."""
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog="clustafari-worker")
     parser.add_argument(
         "filename",
         type=pathlib.Path,
-        help="Path to the joblib file.",
+        nargs="?",
+        help="Path to the joblib file or to a job array manifest.",
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Execute job files read line by line from stdin.",
+    )
+    parser.add_argument(
+        "--preimport",
+        action="append",
+        default=[],
+        metavar="MODULES",
+        help="Comma-separated modules to import before the first job, can be given multiple times.",
+    )
+
+    arguments = parser.parse_args(argv)
+    if not arguments.serve and arguments.filename is None:
+        parser.error("filename is required unless --serve is given")
+    return arguments
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the worker, the entry point of 'clustafari-worker'."""
+    arguments = parse_arguments(argv)
+    preimport([module for modules in arguments.preimport for module in modules.split(",") if module])
 
-    return parser.parse_args()
+    if arguments.serve:
+        serve()
+    else:
+        execute(arguments)
 
 
 if __name__ == "__main__":
-    execute(parse_arguments())
+    main()
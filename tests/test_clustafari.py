@@ -1,11 +1,42 @@
 #!/usr/bin/env python
 """Tests for `pyclustafari` package."""
+import asyncio
 import os
+import pickle
+import subprocess
+import sys
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+import numpy as np
 import pytest
 
-from clustafari import ClusterContext, DummyConfig, SlurmConfig, SubprocessConfig
+from clustafari import (
+    AsyncClusterContext,
+    ClusterContext,
+    DummyConfig,
+    PoolConfig,
+    QueueConfig,
+    SlurmConfig,
+    SubprocessConfig,
+    as_completed,
+)
+from clustafari.cache import ResultCache
+from clustafari.exceptions import RunnableStateError, StateError
+from clustafari.notify import NOTIFY_ADDRESS, NotificationListener, notify
 from clustafari.resources import CPUPerTaskResource, MemoryPerNodeResource
+from clustafari.runner.slurm.info import SlurmInformation
+from clustafari.runner.slurm.scaler import PilotScaler
+from clustafari.runner.slurm.scheduler import PENDING, LocalScheduler
+from clustafari.runner.slurm.status import SlurmStatusCache
+from clustafari.serialization import dump, load, read_spec
+from clustafari.storage import Storage
+from clustafari.taskqueue import DirectoryQueue
+from clustafari.store import SharedObject
+from clustafari.utils import ARRAY_TASK_ID, State, get_manifest_file, read_status, resolve_job_file
+from clustafari.workerstub import StateUtils
 
 
 def fn0():
@@ -24,6 +55,11 @@ def fn3(a, b, c):
     return a + b + c
 
 
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
 @pytest.mark.parametrize(
     "fn, args, kwargs",
     [
@@ -129,3 +165,639 @@ def test_slurm_runner_config():
         SlurmConfig(MemoryPerNodeResource(value="10"), CPUPerTaskResource(value=1))
     ) as ctx:
         assert ctx.apply(fn0) == 1
+
+
+def test_resolve_array_manifest(tmp_path, monkeypatch):
+    files = [tmp_path / f"job{i}.joblib" for i in range(3)]
+    manifest = get_manifest_file(tmp_path)
+    manifest.write_text("".join(f"{f}\n" for f in files))
+
+    for i, file in enumerate(files):
+        monkeypatch.setenv(ARRAY_TASK_ID, str(i))
+        assert resolve_job_file(manifest) == file
+
+    assert resolve_job_file(files[0]) == files[0]
+
+
+class FakeSlurmBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def load(self, jobids):
+        self.calls += 1
+        return {jobid: {"job_id": jobid, "state": "RUNNING"} for jobid in jobids if jobid != 3}
+
+
+def test_slurm_status_cache(tmp_path):
+    backend = FakeSlurmBackend()
+    status = SlurmStatusCache(interval=60, backend=backend)
+    files = (tmp_path / "job.out", tmp_path / "job.err")
+    infos = [SlurmInformation(jobid, status=status, files=files) for jobid in range(1, 5)]
+
+    assert [info.debug_info().get("job_id") for info in infos] == [1, 2, None, 4]
+    assert backend.calls == 1
+
+    files[0].write_text("output")
+    assert infos[0].output_ == "output"
+    del infos
+    assert backend.calls == 1
+    assert not files[0].exists()
+
+
+def test_slurm_status_cache_track(tmp_path):
+    backend = FakeSlurmBackend()
+    status = SlurmStatusCache(interval=0.2, backend=backend)
+    status.track(1)
+    assert status.get(1)["state"] == "RUNNING"
+
+    # Newly submitted jobs don't trigger a refresh before the interval expired.
+    status.track(2)
+    assert status.get(2) == {"job_id": 2, "state": PENDING}
+    assert backend.calls == 1
+
+    time.sleep(0.3)
+    assert status.get(2)["state"] == "RUNNING"
+    assert backend.calls == 2
+
+
+def test_slurm_status_cache_shared_jobid(tmp_path):
+    backend = FakeSlurmBackend()
+    status = SlurmStatusCache(interval=0, backend=backend)
+    infos = [SlurmInformation(1, array_task_id=i, status=status) for i in range(2)]
+    assert infos[1].debug_info()["state"] == "RUNNING"
+
+    # The job stays tracked as long as one of its tasks is alive.
+    del infos[0]
+    assert infos[0].debug_info()["state"] == "RUNNING"
+    del infos
+    assert status.get(1) is None
+
+
+def test_slurm_status_local_scheduler(tmp_path):
+    scheduler = LocalScheduler()
+    config = SlurmConfig(storage=tmp_path, status_interval=0, scheduler=scheduler)
+    with ClusterContext(config) as ctx:
+        runobj = ctx.apply_async(sleep, 1)
+        assert runobj.info.debug_info()["state"] in {PENDING, "RUNNING"}
+        assert runobj.get(blocking=True, timeout=30) == 1
+
+    scheduler.wait()
+    assert runobj.info.debug_info() == {}
+
+
+def test_notification_listener(tmp_path, monkeypatch):
+    listener = NotificationListener(host="127.0.0.1")
+    monkeypatch.setenv(NOTIFY_ADDRESS, listener.address)
+    statefile = tmp_path / "job.state"
+
+    assert not listener.wait(statefile, timeout=0.01)
+    assert not listener.active
+    notify(statefile, State.RUNNING)
+    assert not listener.wait(statefile, timeout=0.2)
+    assert listener.state(statefile) == State.RUNNING
+    assert listener.active
+
+    notify(statefile, State.FINISHED)
+    assert listener.wait(statefile, timeout=5)
+    assert listener.state(statefile) == State.FINISHED
+
+    listener.forget(statefile)
+    assert listener.state(statefile) is None
+
+    # Datagrams without the token of the listener are dropped.
+    host, port, _ = listener.address.split(":")
+    monkeypatch.setenv(NOTIFY_ADDRESS, f"{host}:{port}:wrong")
+    notify(statefile, State.FINISHED)
+    assert not listener.wait(statefile, timeout=0.2)
+    assert listener.state(statefile) is None
+    listener.close()
+
+
+def test_notification_listener_ipv6(tmp_path, monkeypatch):
+    try:
+        listener = NotificationListener(host="::1", fallback_interval=0.5)
+    except OSError:
+        pytest.skip("IPv6 not available")
+
+    monkeypatch.setenv(NOTIFY_ADDRESS, listener.address)
+    assert listener.address.startswith("[::1]:")
+    assert listener.fallback_interval == 0.5
+
+    notify(tmp_path / "job.state", State.FINISHED)
+    assert listener.wait(tmp_path / "job.state", timeout=5)
+    listener.close()
+
+
+def test_notification_without_state_file(tmp_path):
+    with ClusterContext(SubprocessConfig(storage=tmp_path)) as ctx:
+        runobj = ctx.apply_async(sleep, 1)
+        notify(runobj.statefile, State.FINISHED)
+        time.sleep(0.2)
+
+        # A notification only wakes up waiters, the job is running until its state file is final.
+        assert not runobj.is_finished()
+        assert runobj.tempdir.exists()
+        assert runobj.get(blocking=True, timeout=30) == 1
+
+
+@pytest.mark.parametrize("config", [DummyConfig, SubprocessConfig])
+def test_imap(config):
+    args = [(i,) for i in range(4)]
+    with ClusterContext(config()) as ctx:
+        assert list(ctx.imap(fn1, args)) == [fn1(*a) for a in args]
+        assert sorted(ctx.imap_unordered(fn1, args)) == [fn1(*a) for a in args]
+
+
+@pytest.mark.parametrize("config", [DummyConfig, SubprocessConfig])
+@pytest.mark.parametrize("chunksize", [1, 2])
+def test_imap_window(config, chunksize):
+    pulled = []
+
+    def arguments():
+        for i in range(7):
+            pulled.append(i)
+            yield (i,)
+
+    with ClusterContext(config()) as ctx:
+        results = ctx.imap(fn1, arguments(), chunksize=chunksize, window=2)
+        first = next(results)
+        assert len(pulled) <= 2 + chunksize
+        assert [first, *results] == [fn1(i) for i in range(7)]
+
+        results = ctx.imap_unordered(fn1, arguments(), chunksize=chunksize, window=2)
+        assert sorted(results) == [fn1(i) for i in range(7)]
+
+
+def test_as_completed():
+    with ClusterContext(SubprocessConfig()) as ctx:
+        runnables = ctx.map_async(fn2, [(1, 2), (3, 4), (5, 6)])
+        finished = list(as_completed(runnables, timeout=60))
+        assert sorted(r.get() for r in finished) == [3, 7, 11]
+
+    assert sorted(id(r) for r in finished) == sorted(id(r) for r in runnables)
+
+
+@pytest.mark.parametrize("config", [DummyConfig, SubprocessConfig])
+@pytest.mark.parametrize("chunksize", [2, 3, 10])
+def test_map_chunksize(config, chunksize):
+    args = [(i,) for i in range(5)]
+    with ClusterContext(config()) as ctx:
+        assert ctx.map(fn1, args, chunksize=chunksize) == [fn1(*a) for a in args]
+
+
+def fn_fail(a):
+    if a == 1:
+        raise ValueError("fail")
+    return a
+
+
+def test_map_chunksize_partial_failure():
+    with ClusterContext(SubprocessConfig()) as ctx:
+        runnables = ctx.map_async(fn_fail, [(0,), (1,), (2,)], chunksize=3)
+        assert runnables[0].get(blocking=True) == 0
+        assert runnables[2].get(blocking=True) == 2
+        with pytest.raises(StateError):
+            runnables[1].get(blocking=True)
+
+
+def test_shared_function(tmp_path):
+    shared = SharedObject(partial(fn3, c=1), directory=tmp_path)
+    copies = [pickle.loads(pickle.dumps(shared)) for _ in range(3)]
+
+    assert list(tmp_path.iterdir()) == [shared.file]
+    assert all(copy.load()(1, 2) == 4 for copy in copies)
+
+    del copies
+    assert shared.file.exists()
+    del shared
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(("config", "shared"), [(DummyConfig, False), (PoolConfig, False), (SubprocessConfig, True)])
+def test_shared_function_runners(config, shared):
+    runner = config().runner
+    runobjs = runner.map_async(fn3, [(1, 2)], c=1)
+    assert (runobjs[0].shared_function is not None) == shared
+    assert runobjs[0].get(blocking=True, timeout=30) == 4
+
+
+def fn_array(a, scale=1):
+    assert isinstance(a, np.memmap)
+    return a * scale, a.sum()
+
+
+def test_mmap_transport():
+    array = np.arange(1000, dtype=np.float64)
+    with ClusterContext(SubprocessConfig(mmap_threshold=1024)) as ctx:
+        result, total = ctx.apply(fn_array, array, scale=2)
+
+    assert isinstance(result, np.memmap)
+    assert np.array_equal(result, array * 2)
+    assert total == array.sum()
+
+
+def fn_pid(a):
+    return a, os.getpid()
+
+
+def test_subprocess_pool():
+    config = SubprocessConfig(pool_size=2)
+    with ClusterContext(config) as ctx:
+        results = ctx.map(fn_pid, [(i,) for i in range(6)])
+    config.runner.close()
+
+    assert [a for a, _ in results] == list(range(6))
+    assert len({pid for _, pid in results}) <= 2
+    assert os.getpid() not in {pid for _, pid in results}
+
+
+def test_subprocess_max_concurrent():
+    config = SubprocessConfig(max_concurrent=2)
+    with ClusterContext(config) as ctx:
+        runnables = ctx.map_async(fn_pid, [(i,) for i in range(4)])
+        results = [r.get(blocking=True, timeout=60) for r in runnables]
+    config.runner.close()
+
+    assert [a for a, _ in results] == list(range(4))
+    assert len({pid for _, pid in results}) == 4
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    with ClusterContext(DummyConfig(), cache=cache) as ctx:
+        assert ctx.map(fn_pid, [(i,) for i in range(3)]) == [(i, os.getpid()) for i in range(3)]
+
+    assert len(list(tmp_path.glob("*/*.joblib"))) == 3
+
+    with ClusterContext(SubprocessConfig(), cache=cache) as ctx:
+        results = ctx.map(fn_pid, [(i,) for i in range(4)])
+        assert ctx.apply(fn_pid, 1) == (1, os.getpid())
+
+    # Only the new point is executed by the subprocess runner.
+    assert results[:3] == [(i, os.getpid()) for i in range(3)]
+    assert results[3][0] == 3
+    assert results[3][1] != os.getpid()
+
+    ResultCache(tmp_path, max_size=0).evict()
+    assert not list(tmp_path.glob("*/*.joblib"))
+
+
+def fn_helper(a):
+    return a + 1
+
+
+def fn_uses_helper(a):
+    return fn_helper(a) * SCALE
+
+
+SCALE = 2
+
+
+def test_result_cache_references(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    key = cache.key(fn_uses_helper, (1,), {})
+    assert cache.key(fn_uses_helper, (1,), {}) == key
+
+    # Changing a helper or a global variable used by the function invalidates its results.
+    monkeypatch.setattr(sys.modules[__name__], "fn_helper", fn0)
+    assert cache.key(fn_uses_helper, (1,), {}) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(sys.modules[__name__], "SCALE", 3)
+    assert cache.key(fn_uses_helper, (1,), {}) != key
+
+    def closure(offset):
+        return lambda a: a + offset
+
+    assert cache.key(closure(1), (1,), {}) != cache.key(closure(2), (1,), {})
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def increment(self, value):
+        print("increment")
+        self.count += value
+        return self.count
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_pool_runner(executor):
+    config = PoolConfig(executor=executor, max_workers=2)
+    with ClusterContext(config) as ctx:
+        assert ctx.map(fn2, [(i, 1) for i in range(5)]) == [i + 1 for i in range(5)]
+
+        runobj = ctx.apply_async(Counter().increment, 2, return_object=True)
+        counter, result = runobj.get(blocking=True)
+        assert (counter.count, result) == (2, 2)
+        if executor == "process":
+            assert runobj.info.output == "increment\n"
+
+        runobj = ctx.apply_async(fn_fail, 1)
+        with pytest.raises(StateError):
+            runobj.get(blocking=True)
+
+        assert sorted(r.get() for r in as_completed(ctx.map_async(fn1, [(i,) for i in range(4)]))) == [1, 2, 3, 4]
+    config.runner.close()
+
+
+@pytest.mark.parametrize("config", [SubprocessConfig(), PoolConfig(executor="thread")])
+def test_async_context(config):
+    async def run():
+        async with AsyncClusterContext(config) as ctx:
+            single = await ctx.apply(fn2, 1, b=2)
+            results = await ctx.map(fn1, [(i,) for i in range(4)])
+            unordered = [r async for r in ctx.imap_unordered(fn1, [(i,) for i in range(4)])]
+            runobj = await ctx.apply_async(fn_fail, 1)
+            with pytest.raises(StateError):
+                await runobj
+        return single, results, unordered
+
+    single, results, unordered = asyncio.run(run())
+    config.runner.close()
+
+    assert single == 3
+    assert results == [1, 2, 3, 4]
+    assert sorted(unordered) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("serializer", ["joblib", "joblib:zlib:3", "cloudpickle", "pickle5"])
+def test_serializer(tmp_path, serializer):
+    data = (fn2, (np.arange(1000),), {"b": [1, 2]})
+    dump(data, tmp_path / "job", serializer)
+
+    assert read_spec(tmp_path / "job") == serializer
+    fn, args, kwargs = load(tmp_path / "job")
+    assert fn is fn2
+    assert np.array_equal(args[0], data[1][0])
+    assert kwargs == data[2]
+
+    with ClusterContext(SubprocessConfig(serializer=serializer)) as ctx:
+        assert ctx.apply(fn2, 1, b=2) == 3
+
+
+def test_serializer_map():
+    with ClusterContext(SubprocessConfig(serializer="cloudpickle")) as ctx:
+        assert ctx.apply(lambda a: a + 1, 1) == 2
+        assert ctx.map(lambda a: a + 1, [(1,), (2,)]) == [2, 3]
+        assert list(ctx.imap(lambda a, b: a + b, [(1,), (2,)], b=1)) == [2, 3]
+
+
+@pytest.mark.parametrize(
+    "serializer", ["joblib:zlib:3:4", "joblib:bogus", "joblib:zstd", "joblib:zlib:x", "joblib:zlib:10"]
+)
+def test_unknown_serializer(serializer):
+    with pytest.raises(ValueError, match="Unknown serializer"):
+        SubprocessConfig(serializer=serializer)
+
+
+def test_storage(tmp_path):
+    storage = Storage(tmp_path, sharded=True)
+    with ClusterContext(SubprocessConfig(storage=storage)) as ctx:
+        runobj = ctx.apply_async(fn1, 1)
+        run = runobj.tempdir.parent.parent
+        assert run.parent == tmp_path
+        assert runobj.tempdir.parent.name == runobj.tempdir.name[:2]
+        assert runobj.get(blocking=True) == 2
+
+        assert ctx.map(fn2, [(i, 1) for i in range(3)]) == [1, 2, 3]
+        unread = ctx.apply_async(fn1, 2)
+        list(as_completed([unread], timeout=60))
+
+    assert not run.exists()
+    assert unread.is_finished()
+    with pytest.raises(RunnableStateError, match="removed with the run directory"):
+        unread.get()
+
+    with ClusterContext(SubprocessConfig(storage=storage)) as ctx:
+        unread = ctx.apply_async(fn1, 2)
+        list(as_completed([unread], timeout=60))
+        ctx.cleanup(keep_results=True)
+
+    assert unread.get() == 3
+
+
+def test_status_file(tmp_path):
+    utils = StateUtils(tmp_path / "job.joblib")
+    assert utils.get_state() == State.IDLE
+
+    utils.set_state(State.RUNNING, "Start execution")
+    utils.log("multi\nline")
+    utils.set_state(State.FINISHED)
+
+    assert read_status(utils.statefile) == (State.FINISHED, "Start execution\nmulti\nline\n")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["job.status"]
+
+
+def test_job_ids():
+    with ClusterContext(SubprocessConfig()) as ctx:
+        runobjs = [ctx.apply_async(fn1, 1) for _ in range(2)]
+        assert runobjs[0].job_id != runobjs[1].job_id
+        assert runobjs[0].content_hash() == runobjs[1].content_hash()
+        assert [r.get(blocking=True) for r in runobjs] == [2, 2]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2])
+def test_submit_parallelism(chunksize):
+    with ClusterContext(SubprocessConfig(submit_parallelism=4)) as ctx:
+        assert ctx.map(fn2, [(i, 1) for i in range(9)], chunksize=chunksize) == [i + 1 for i in range(9)]
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, clustafari.workerstub; "
+        "from clustafari import ClusterContext, SubprocessConfig; "
+        "print(' '.join(m for m in ('pyslurm', 'yaml', 'joblib') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert out.split() == []
+
+
+def test_subprocess_no_output_files(tmp_path):
+    # Importing this module in the worker runs the slurm check, which writes to stderr.
+    runobj = SubprocessConfig(storage=tmp_path).runner.apply_async(textwrap.dedent, "  text")
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        files = {file.suffix for file in runobj.tempdir.iterdir()}
+        if runobj.is_finished() and not files & {".out", ".err"}:
+            break
+        time.sleep(0.1)
+
+    # A silent job leaves no output files.
+    assert runobj.is_finished()
+    assert not files & {".out", ".err"}
+    assert runobj.get() == "text"
+
+
+def test_subprocess_preimport():
+    with ClusterContext(SubprocessConfig(preimport=["json", "missing_module"])) as ctx:
+        assert ctx.map(fn1, [(1,), (2,)]) == [2, 3]
+
+
+def test_slurm_worker_script(tmp_path):
+    config = SlurmConfig(storage=tmp_path, preimport=["json"])
+    runobj = config.runner._create_runnable(fn1, 1)
+    runobj.prepare()
+
+    batch = config.runner._script(runobj.tempfile)
+    script = tmp_path / "batch"
+    script.write_text(batch["script"])
+    script.chmod(0o755)
+    subprocess.run([str(script), *batch["script_args"].split()], check=True)
+
+    assert batch["script_args"].startswith("--preimport json ")
+    assert runobj.get(blocking=True, timeout=30) == 2
+
+
+def test_directory_queue(tmp_path):
+    queue = DirectoryQueue(tmp_path / "queue")
+    files = [tmp_path / f"job-{i}.joblib" for i in range(20)]
+    queue.put(files)
+    assert len(queue) == 20
+    assert queue.claim() == files[0]
+
+    other = DirectoryQueue(tmp_path / "queue")
+    with ThreadPoolExecutor(4) as executor:
+        claimed = list(executor.map(lambda _: other.claim(), range(25)))
+
+    assert sorted(str(f) for f in claimed if f is not None) == sorted(str(f) for f in files[1:])
+    assert len(queue) == 0
+    assert queue.claim(timeout=0.1) is None
+
+
+def test_directory_queue_lease(tmp_path):
+    runobj = SubprocessConfig(storage=tmp_path).runner._create_runnable(fn1, 1)
+    runobj.prepare()
+    queue = DirectoryQueue(tmp_path / "queue", lease_timeout=0.2, max_attempts=2)
+    queue.put([runobj.tempfile])
+    assert queue.claim() == runobj.tempfile
+
+    # The lease is renewed by heartbeats, so the job file stays claimed.
+    other = DirectoryQueue(tmp_path / "queue", lease_timeout=0.2, max_attempts=2)
+    for _ in range(3):
+        time.sleep(0.1)
+        queue.heartbeat()
+        assert other.requeue_expired() == 0
+
+    # Without heartbeats, the lease expires and the job file is claimed by another consumer.
+    time.sleep(0.3)
+    assert other.claim(timeout=1) == runobj.tempfile
+
+    # The second lost lease exceeds 'max_attempts', so the job is given up.
+    time.sleep(0.3)
+    assert queue.requeue_expired() == 0
+    assert read_status(runobj.statefile)[0] == State.FAILED
+    assert queue.claim() is None
+
+
+def test_queue_runner(tmp_path):
+    config = QueueConfig(storage=tmp_path, workers=2, lease_timeout=5)
+    args = [(i,) for i in range(6)]
+    with ClusterContext(config) as ctx:
+        assert ctx.map(fn1, args) == [fn1(*a) for a in args]
+        assert ctx.map(fn2, [(1, 2), (3, 4)], chunksize=2) == [3, 7]
+        assert ctx.apply(fn0) == 1
+
+    config.runner.close()
+    assert len(DirectoryQueue(config.directory)) == 0
+    assert not list((config.directory / "claimed").iterdir())
+
+
+@pytest.mark.parametrize(
+    "options", [{"preimport": ["json"]}, {"pilot": True, "pilot_workers": 2}, {"pilot": True, "pilot_idle_timeout": 10}]
+)
+def test_slurm_job_file_options(options):
+    with pytest.raises(ValueError, match="custom 'jobfile'"):
+        SlurmConfig(jobfile="clustafari.job", scheduler=LocalScheduler(), **options)
+
+    # Pilot options without pilot mode are unused.
+    SlurmConfig(jobfile="clustafari.job", pilot_workers=2, scheduler=LocalScheduler())
+
+
+def test_slurm_pilot(tmp_path):
+    scheduler = LocalScheduler()
+    config = SlurmConfig(storage=tmp_path, pilot=True, pilot_workers=2, scheduler=scheduler)
+    args = [(i,) for i in range(6)]
+    with ClusterContext(config) as ctx:
+        assert ctx.map(fn1, args) == [fn1(*a) for a in args]
+        assert ctx.map(fn2, [(1, 2), (3, 4)], chunksize=2) == [3, 7]
+
+    scheduler.wait()
+    assert len(scheduler.processes) == 2
+
+
+class PendingScheduler:
+    def __init__(self):
+        self.submitted = []
+        self.cancelled = []
+
+    def submit(self, **options):
+        self.submitted.append(len(self.submitted) + 1)
+        return self.submitted[-1]
+
+    def status(self, jobids):
+        return {jobid: PENDING for jobid in jobids if jobid not in self.cancelled}
+
+    def cancel(self, jobid):
+        self.cancelled.append(jobid)
+
+
+def test_pilot_scaler(tmp_path):
+    queue = DirectoryQueue(tmp_path / "queue")
+    queue.put(tmp_path / f"job-{i}.joblib" for i in range(5))
+    scheduler = PendingScheduler()
+    scaler = PilotScaler(queue, lambda: scheduler.submit(), scheduler, max_pilots=3, jobs_per_pilot=2)
+
+    assert scaler.scale()
+    assert scaler.pilots == {1, 2, 3}
+
+    for _ in range(4):
+        queue.claim()
+    assert scaler.scale()
+    assert scaler.pilots == {1}
+    assert scheduler.cancelled == [3, 2]
+
+    queue.remove()
+    assert not scaler.scale()
+    assert scheduler.cancelled == [3, 2, 1]
+
+
+def test_pilot_scaler_unreported(tmp_path):
+    queue = DirectoryQueue(tmp_path / "queue")
+    queue.put(tmp_path / f"job-{i}.joblib" for i in range(4))
+    scheduler = PendingScheduler()
+    visible = set()
+    scheduler.status = lambda jobids: {jobid: PENDING for jobid in jobids if jobid in visible}
+    scaler = PilotScaler(queue, lambda: scheduler.submit(), scheduler, max_pilots=2, grace_period=0.2)
+
+    # Pilots the scheduler doesn't list yet are kept instead of being submitted again.
+    assert scaler.scale()
+    assert scaler.scale()
+    assert scaler.pilots == {1, 2}
+
+    # Pilots which are gone after being listed, or not listed within the grace period, are forgotten.
+    visible.add(1)
+    assert scaler.scale()
+    visible.clear()
+    time.sleep(0.3)
+    assert scaler.scale()
+    assert scaler.pilots == {3, 4}
+    assert scheduler.submitted == [1, 2, 3, 4]
+
+
+def test_slurm_elastic_pilots(tmp_path):
+    scheduler = LocalScheduler()
+    config = SlurmConfig(
+        storage=tmp_path, pilot=True, pilot_workers=1, max_pilots=3, scale_interval=0.2, scheduler=scheduler
+    )
+    args = [(i,) for i in range(6)]
+    with ClusterContext(config) as ctx:
+        runnables = ctx.map_async(fn1, args)
+        finished = list(as_completed(runnables, timeout=60))
+        # Each job file records the pilot which executed it.
+        jobids = {runobj.info.jobid for runobj in finished}
+        assert sorted(runobj.get() for runobj in finished) == [fn1(*a) for a in args]
+
+    scheduler.wait()
+    assert len(scheduler.processes) == 3
+    assert jobids <= set(scheduler.processes)